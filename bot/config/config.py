@@ -7,9 +7,19 @@ class Settings(BaseSettings):
     API_ID: int
     API_HASH: str
 
+    API_BASE_URL: str = 'https://api.paws.community/v1'
+
     SLEEP_TIME: list[int] = [7200, 10800]
     START_DELAY: list[int] = [5, 25]
+    START_WINDOW: int = 600
+    TG_WEB_DATA_TTL: int = 86400
+    TG_WEB_DATA_REFRESH_MARGIN: int = 600
+    WARMUP_CONCURRENCY: int = 20
+    SCHEDULER_WORKERS: int = 100
     AUTO_TASK: bool = True
+    TASKS_CONCURRENCY: int = 3
+    TASKS_RATE: int = 20
+    TASKS_JITTER: list[int] = [1, 4]
     JOIN_TG_CHANNELS: bool = False
     REF_ID: str = 'idqtVYZG'
     DISABLED_TASKS: list[str] = ['boost', 'emoji']
@@ -24,6 +34,38 @@ class Settings(BaseSettings):
     CHECK_ELIGIBILITY: bool = True
     SOLVE_CAPTCHA: bool = False
     CAPTCHA_API_KEY: str = ""
+    CAPTCHA_API_URL: str = "http://api.sctg.xyz"
+    CAPTCHA_POOL_SIZE: int = 5
+    CAPTCHA_TOKEN_TTL: int = 110
+    ENDPOINTS_CHECK_TTL: int = 3600
+    RATE_LIMITS: dict[str, float] = {'api.paws.community': 2, 'plausible.io': 1,
+                                     'api.botprod.ru': 1, 'api.sctg.xyz': 5}
+    RATE_LIMIT_DEFAULT: float = 5
+    RATE_LIMIT_BURST: int = 5
+    RATE_LIMIT_REPORT_INTERVAL: int = 600
+    METRICS_PORT: int = 0
+    LOG_JSON: bool = False
+    LOG_ENQUEUE: bool = False
+    LOG_SAMPLING: dict[str, float] = {}
+    LOG_ACCOUNT_LEVELS: dict[str, str] = {}
+    PROXY_CHECK_INTERVAL: int = 600
+    PROXY_CHECK_TIMEOUT: int = 20
+    PROXY_CHECK_CONCURRENCY: int = 50
+    PROXY_MAX_FAILURES: int = 2
+    PROXY_POOLS: dict[str, list[str]] = {}
+    PROXY_FAILOVER_ERRORS: int = 3
+    PROXY_MAX_LATENCY: float = 10
+    RETRY_ATTEMPTS: int = 3
+    RETRY_BASE_DELAY: float = 2
+    RETRY_MAX_DELAY: float = 30
+    RETRY_CYCLE_DELAY: int = 60
+    RETRY_CYCLE_MAX_DELAY: int = 1800
+    CIRCUIT_FAILURES: int = 20
+    CIRCUIT_OPEN_TIME: int = 60
+    CIRCUIT_MAX_OPEN_TIME: int = 900
+    CIRCUIT_RAMP_REQUESTS: int = 10
+    HTTP2: bool = False
+    HTTP2_MAX_CONNECTIONS: int = 4
 
 
 settings = Settings()
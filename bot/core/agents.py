@@ -251,12 +251,32 @@ telegram_versions = ['11.4.2']
 
 performance_class = ['AVERAGE', 'HIGH']
 
+chrome_major_versions = list(existing_versions)
+firefox_versions = list(range(100, 127))  # Last 10 versions of Firefox
+
+tg_version_pattern = re.compile(r'Telegram-Android/([\d\.]+)')
+android_device_pattern = re.compile(r'Android \d+.*?; (.*?)(?=\))')
+android_version_pattern = re.compile(r'Android (\d+(\.\d+)*)')
+chrome_version_pattern = re.compile(r'Chrome/(\d+)')
+
+
+def build_device_index() -> dict[str, str]:
+    # same answer as the substring scan over android_devices, but with a single lookup
+    index = {}
+    for brand, models in android_devices.items():
+        for model in models:
+            for start in range(len(model) + 1):
+                for end in range(start, len(model) + 1):
+                    index.setdefault(model[start:end], brand)
+    return index
 
-def generate_random_user_agent(device_type='android', browser_type='chrome'):
-    firefox_versions = list(range(100, 127))  # Last 10 versions of Firefox
 
+device_index = build_device_index()
+
+
+def generate_random_user_agent(device_type='android', browser_type='chrome'):
     if browser_type == 'chrome':
-        major_version = random.choice(list(existing_versions.keys()))
+        major_version = random.choice(chrome_major_versions)
         browser_version = random.choice(existing_versions[major_version])
     elif browser_type == 'firefox':
         browser_version = random.choice(firefox_versions)
@@ -313,7 +333,7 @@ def is_user_agent_valid(user_agent: str) -> bool:
 
 
 def is_latest_tg_version(user_agent: str) -> bool:
-    tg_version = re.search(r'Telegram-Android/([\d\.]+)', user_agent)
+    tg_version = tg_version_pattern.search(user_agent)
     if tg_version:
         version = tg_version.group(1)
         return version in telegram_versions
@@ -321,7 +341,7 @@ def is_latest_tg_version(user_agent: str) -> bool:
 
 
 def get_telegram_custom_params(user_agent: str) -> str | None:
-    android_device = re.search(r'Android \d+.*?; (.*?)(?=\))', user_agent)
+    android_device = android_device_pattern.search(user_agent)
     if not android_device:
         return None
     android_device = android_device.group(1)
@@ -330,7 +350,7 @@ def get_telegram_custom_params(user_agent: str) -> str | None:
         return None
     telegram_version = random.choice(telegram_versions)
     performance_version = random.choice(performance_class)
-    android_version = re.search(r'Android (\d+(\.\d+)*)', user_agent).group(1).split('.')[0]
+    android_version = android_version_pattern.search(user_agent).group(1).split('.')[0]
     tg_params = f" Telegram-Android/{telegram_version} " \
                 f"({android_manufacturer} {android_device}; Android {android_version}; " \
                 f"SDK {android_sdks[android_version]}; {performance_version})"
@@ -338,13 +358,9 @@ def get_telegram_custom_params(user_agent: str) -> str | None:
 
 
 def get_sec_ch_ua(user_agent: str) -> str:
-    browser_version = re.search(r'Chrome/(\d+)', user_agent).group(1)
+    browser_version = chrome_version_pattern.search(user_agent).group(1)
     return f'"Android WebView";v="{browser_version}", "Chromium";v="{browser_version}", "Not_A Brand";v="24"'
 
 
 def get_manufacturer(android_device: str) -> str | None:
-    for brand in android_devices:
-        for model in android_devices[brand]:
-            if android_device in model:
-                return brand
-    return None
+    return device_index.get(android_device)
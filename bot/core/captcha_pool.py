@@ -0,0 +1,97 @@
+import asyncio
+from random import randint
+from time import time
+
+from bot.config import settings
+from bot.core.solver_tg import get_async_solver
+from bot.utils import logger
+
+
+captcha_data = {
+    "method": "userrecaptcha",
+    "pageurl": "https://paws.community/app?tab=claim",
+    "sitekey": "6Lda_s0qAAAAAItgCSBeQN_DVlM9YOk9MccqMG6_",
+    "enterprise": "1",
+    "action": "submit",
+    "version": "v2"
+}
+
+
+class CaptchaTokenPool:
+    def __init__(self):
+        self.queued: dict[str, str] = {}
+        self.solving: dict[str, asyncio.Task] = {}
+        self.tokens: dict[str, tuple[str, float]] = {}
+        self.paused_until = 0.0
+
+    def register(self, session_name: str, user_agent: str) -> None:
+        _, solved_at = self.tokens.get(session_name, (None, 0))
+        if time() - solved_at >= settings.CAPTCHA_TOKEN_TTL:
+            self.tokens.pop(session_name, None)
+        if session_name not in self.solving and session_name not in self.tokens:
+            self.queued[session_name] = user_agent
+            self.refill()
+
+    def discard(self, session_name: str) -> None:
+        self.queued.pop(session_name, None)
+        self.tokens.pop(session_name, None)
+
+    def take(self, session_name: str) -> str | None:
+        token, solved_at = self.tokens.pop(session_name, (None, 0))
+        return token if time() - solved_at < settings.CAPTCHA_TOKEN_TTL else None
+
+    def refill(self) -> None:
+        # CAPTCHA_POOL_SIZE caps only the solves started ahead of demand
+        while self.queued and len(self.solving) < settings.CAPTCHA_POOL_SIZE and time() >= self.paused_until:
+            session_name = next(iter(self.queued))
+            self.start(session_name, self.queued.pop(session_name))
+
+    def start(self, session_name: str, user_agent: str) -> asyncio.Task:
+        task = asyncio.create_task(self.solve(session_name, user_agent))
+        self.solving[session_name] = task
+        task.add_done_callback(lambda task: self.finish(session_name, task))
+        return task
+
+    def finish(self, session_name: str, task: asyncio.Task) -> None:
+        if self.solving.get(session_name) is task:
+            del self.solving[session_name]
+        if not task.cancelled() and task.exception() is None and task.result():
+            self.tokens[session_name] = (task.result(), time())
+        self.refill()
+
+    async def solve(self, session_name: str, user_agent: str) -> str | None:
+        solver = get_async_solver(key=f"{settings.CAPTCHA_API_KEY}|SOFTID918432365")
+        for attempt in range(3):
+            logger.info(f"{session_name} | Attempt to solve CAPTCHA ({attempt + 1}/3) "
+                        f"| Solving: <e>{len(self.solving)}</e>, Queued: <e>{len(self.queued)}</e>")
+            try:
+                balance = float(await solver.get_balance())
+                if balance < 0.05:
+                    logger.warning(f"{session_name} | Not enough balance in 2Captcha service")
+                    self.paused_until = time() + 300
+                    return None
+                # every token is solved with the User-Agent of the account that sends it
+                result = (await solver.run({**captcha_data, 'userAgent': user_agent}))[:20]
+                if result and not result.startswith('ERROR'):
+                    logger.info(f"{session_name} | Successfully solved CAPTCHA")
+                    return result
+            except Exception as e:
+                logger.warning(f"{session_name} | Error while solving captcha {e}")
+            await asyncio.sleep(delay=randint(5, 10))
+        return None
+
+    async def acquire(self, session_name: str, user_agent: str) -> str | None:
+        self.queued.pop(session_name, None)
+        token = self.take(session_name)
+        if token or time() < self.paused_until:
+            return token
+        # no solve ahead of time or its token expired, the account waits for its own one
+        task = self.solving.get(session_name) or self.start(session_name, user_agent)
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout=settings.CAPTCHA_TOKEN_TTL + 300)
+        except asyncio.TimeoutError:
+            return None
+        return self.take(session_name)
+
+
+captcha_pool = CaptchaTokenPool()
@@ -0,0 +1,80 @@
+from random import random
+from time import monotonic
+
+from bot.config import settings
+from bot.exceptions import CircuitOpen
+from bot.utils import logger
+from bot.utils.metrics import circuit_state
+
+# statuses that point to an overloaded or failing API rather than to a bad request
+retryable_statuses = frozenset({408, 425, 429, 500, 502, 503, 504, 520, 521, 522, 523, 524})
+
+states = {'closed': 0, 'half_open': 1, 'open': 2}
+
+
+# shared by every account of the process, a half-open breaker admits one more call for every success
+class CircuitBreaker:
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.state = 'closed'
+        self.failures = 0
+        self.successes = 0
+        self.opened_at = 0.0
+        self.open_time = settings.CIRCUIT_OPEN_TIME
+
+    @property
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_at + self.open_time - monotonic())
+
+    def set_state(self, state: str) -> None:
+        self.state = state
+        circuit_state.set(self.endpoint, value=states[state])
+
+    def open(self) -> None:
+        self.opened_at = monotonic()
+        self.set_state('open')
+        logger.warning(f"Circuit breaker | <lc>{self.endpoint}</lc> is failing, "
+                       f"pausing calls for <y>{self.open_time}</y> sec")
+
+    def check(self) -> None:
+        if self.state == 'open':
+            if self.retry_after > 0:
+                raise CircuitOpen(self.endpoint, self.retry_after)
+            self.successes = 0
+            self.set_state('half_open')
+            logger.info(f"Circuit breaker | <lc>{self.endpoint}</lc> is probing")
+        if self.state == 'half_open' and random() * settings.CIRCUIT_RAMP_REQUESTS >= self.successes + 1:
+            raise CircuitOpen(self.endpoint, settings.CIRCUIT_OPEN_TIME)
+
+    def record(self, status_code: int) -> None:
+        if status_code in retryable_statuses:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def record_success(self) -> None:
+        self.failures = 0
+        if self.state == 'half_open':
+            self.successes += 1
+            if self.successes >= settings.CIRCUIT_RAMP_REQUESTS:
+                self.open_time = settings.CIRCUIT_OPEN_TIME
+                self.set_state('closed')
+                logger.success(f"Circuit breaker | <lc>{self.endpoint}</lc> recovered")
+
+    def record_failure(self) -> None:
+        if self.state == 'half_open':
+            self.open_time = min(self.open_time * 2, settings.CIRCUIT_MAX_OPEN_TIME)
+            self.open()
+        elif self.state == 'closed':
+            self.failures += 1
+            if self.failures >= settings.CIRCUIT_FAILURES:
+                self.open()
+
+
+circuit_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(endpoint: str) -> CircuitBreaker:
+    if endpoint not in circuit_breakers:
+        circuit_breakers[endpoint] = CircuitBreaker(endpoint=endpoint)
+    return circuit_breakers[endpoint]
@@ -1,3 +1,8 @@
+from types import MappingProxyType
+from typing import Mapping
+
+from bot.core.agents import get_sec_ch_ua
+
 headers = {
     'Accept': 'application/json',
     'Accept-Language': 'ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7',
@@ -32,3 +37,11 @@ web_headers = {
     'Sec-Ch-Ua-platform': '"Android"',
     'User-Agent': 'Mozilla/5.0 (Linux; Android 14) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.6422.165 Mobile Safari/537.36'
 }
+
+
+def build_header_profiles(user_agent: str, access_token: str | None = None) -> tuple[Mapping[str, str], Mapping[str, str]]:
+    # profiles are rebuilt only when the token changes, requests never patch a shared dict
+    auth_headers = {'Authorization': f'Bearer {access_token}'} if access_token else {}
+    app_headers = {**headers, 'User-Agent': user_agent, 'Sec-Ch-Ua': get_sec_ch_ua(user_agent), **auth_headers}
+    # the web profile keeps the fingerprint of its template, only the token is added
+    return MappingProxyType(app_headers), MappingProxyType({**web_headers, **auth_headers})
@@ -0,0 +1,186 @@
+import asyncio
+import json
+from http.cookiejar import DefaultCookiePolicy
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Mapping, TypeVar
+from urllib.parse import urlsplit
+
+import aiohttp
+import httpx
+import msgspec
+from aiocfscrape import CloudflareScraper
+from aiohttp_proxy import ProxyConnector
+from aiohttp_proxy.errors import ProxyError, SocksError
+
+from bot.config import settings
+from bot.core.circuit_breaker import get_circuit_breaker
+from bot.core.rate_limiter import get_proxy_label, rate_limiter
+from bot.exceptions import HttpError, SchemaError
+from bot.utils.metrics import http_connections, http_handshake, http_latency, http_requests
+
+if TYPE_CHECKING:
+    from bot.core.proxy_prober import ProxyPool
+
+T = TypeVar('T')
+
+# errors that point to a broken proxy rather than to the API itself
+proxy_errors = (aiohttp.ClientConnectionError, aiohttp.ClientHttpProxyError, asyncio.TimeoutError,
+                OSError, ProxyError, SocksError, httpx.TransportError)
+
+
+class Response:
+    def __init__(self, status_code: int, text: str, url: str):
+        self.status_code = status_code
+        self.text = text
+        self.url = url
+
+    def __bool__(self) -> bool:
+        return self.status_code < 400
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def decode(self, decoder: msgspec.json.Decoder[T]) -> T:
+        try:
+            return decoder.decode(self.text)
+        except msgspec.DecodeError as error:
+            raise SchemaError(url=self.url, message=str(error)) from None
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise HttpError(status_code=self.status_code, url=self.url)
+
+
+def trace_connections(proxy: str, secure: bool):
+    started = 0.0
+
+    async def trace(event: str, info: dict) -> None:
+        nonlocal started
+        if event == 'connection.connect_tcp.started':
+            started = monotonic()
+        elif event == 'connection.connect_tcp.complete':
+            http_connections.inc('http/2', proxy)
+            if not secure:
+                http_handshake.observe('http/2', value=monotonic() - started)
+        elif event == 'connection.start_tls.complete':
+            http_handshake.observe('http/2', value=monotonic() - started)
+    return trace
+
+
+def get_trace_config(proxy: str) -> aiohttp.TraceConfig:
+    async def on_start(session, context, params) -> None:
+        context.started = monotonic()
+
+    async def on_end(session, context, params) -> None:
+        http_connections.inc('http/1.1', proxy)
+        http_handshake.observe('http/1.1', value=monotonic() - context.started)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_start.append(on_start)
+    trace_config.on_connection_create_end.append(on_end)
+    return trace_config
+
+
+http2_clients: dict[str | None, httpx.AsyncClient] = {}
+
+
+def get_http2_client(proxy: str | None) -> httpx.AsyncClient:
+    # the shared client rejects every cookie, each HttpClient keeps its own jar
+    if proxy not in http2_clients:
+        client = httpx.AsyncClient(http2=True, proxy=proxy, trust_env=True,
+                                   limits=httpx.Limits(max_connections=settings.HTTP2_MAX_CONNECTIONS))
+        client.cookies.jar.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        http2_clients[proxy] = client
+    return http2_clients[proxy]
+
+
+async def close_http2_clients() -> None:
+    for client in http2_clients.values():
+        await client.aclose()
+    http2_clients.clear()
+
+
+class HttpClient:
+    def __init__(self, headers: Mapping[str, str], proxy: str | None = None, proxy_pool: 'ProxyPool | None' = None):
+        self.headers = headers
+        self.proxy_pool = proxy_pool
+        self._proxy = proxy
+        self._session: CloudflareScraper | None = None
+        self._session_proxy: str | None = None
+        self.cookies = httpx.Cookies()
+
+    @property
+    def proxy(self) -> str | None:
+        return self.proxy_pool.proxy if self.proxy_pool else self._proxy
+
+    @property
+    def session(self) -> CloudflareScraper:
+        if self._session is None or self._session.closed:
+            connector = ProxyConnector.from_url(self.proxy) if self.proxy else None
+            self._session = CloudflareScraper(connector=connector, trust_env=True,
+                                              trace_configs=[get_trace_config(get_proxy_label(self.proxy))])
+            self._session_proxy = self.proxy
+        return self._session
+
+    async def send_http2(self, method: str, url: str, headers: Mapping[str, str], timeout: float,
+                         **kwargs) -> Response:
+        client = get_http2_client(self.proxy)
+        trace = trace_connections(get_proxy_label(self.proxy), secure=url.startswith('https'))
+        request = client.build_request(method, url, headers=headers, timeout=timeout,
+                                       extensions={'trace': trace}, **kwargs)
+        # connection-specific headers are not allowed in HTTP/2
+        request.headers.pop('Connection', None)
+        self.cookies.set_cookie_header(request)
+        response = await client.send(request)
+        self.cookies.extract_cookies(response)
+        return Response(status_code=response.status_code, text=response.text, url=str(response.url))
+
+    async def request(self, method: str, url: str, headers: Mapping[str, str] | None = None,
+                      timeout: float = 60, **kwargs) -> Response:
+        if self._session is not None and self._session_proxy != self.proxy:
+            # the pool switched to another proxy, the connector has to be rebuilt
+            await self.close()
+        parts = urlsplit(url)
+        is_api = url.startswith(settings.API_BASE_URL)
+        # only the PAWS API is guarded, other hosts fail on their own
+        breaker = get_circuit_breaker(parts.path) if settings.CIRCUIT_FAILURES and is_api else None
+        if breaker:
+            breaker.check()
+        await rate_limiter.acquire(url, self.proxy)
+        proxy = get_proxy_label(self.proxy)
+        status = 'error'
+        started = monotonic()
+        headers = self.headers if headers is None else headers
+        try:
+            if settings.HTTP2 and is_api:
+                result = await self.send_http2(method, url, headers=headers, timeout=timeout, **kwargs)
+            else:
+                async with self.session.request(method, url, headers=headers,
+                                                timeout=aiohttp.ClientTimeout(total=timeout), **kwargs) as response:
+                    result = Response(status_code=response.status, text=await response.text(),
+                                      url=str(response.url))
+            status = result.status_code
+        except proxy_errors:
+            if self.proxy_pool:
+                self.proxy_pool.report_failure()
+            raise
+        finally:
+            elapsed = monotonic() - started
+            http_latency.observe(parts.hostname, parts.path, method, value=elapsed)
+            http_requests.inc(parts.hostname, parts.path, method, status, proxy)
+        if breaker:
+            breaker.record(result.status_code)
+        if self.proxy_pool:
+            self.proxy_pool.report_success(elapsed)
+        return result
+
+    async def get(self, url: str, **kwargs) -> Response:
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> Response:
+        return await self.request('POST', url, **kwargs)
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,90 @@
+import asyncio
+import csv
+import json
+import os
+import sqlite3
+
+from better_proxy import Proxy
+
+from bot.core.agents import generate_random_user_agent
+from bot.utils import logger
+from bot.utils.account_store import account_store
+
+
+def read_accounts_file(path: str) -> list[dict]:
+    with open(path, encoding='utf-8') as file:
+        if path.endswith('.jsonl'):
+            return [json.loads(line) for line in file if line.strip()]
+
+        rows = [row for row in csv.reader(file) if row and row[0].strip()]
+        if rows and rows[0][0].strip() == 'session_name':
+            header, rows = [column.strip() for column in rows[0]], rows[1:]
+        else:
+            header = ['session_name', 'proxy', 'user_agent']
+        return [dict(zip(header, (value.strip() for value in row))) for row in rows]
+
+
+def check_account(account: dict) -> str | None:
+    # returns the reason why the account can't be imported
+    session_name = account.get('session_name')
+    if not session_name:
+        return 'empty session name'
+
+    raw_proxy = account.get('proxy')
+    if raw_proxy:
+        try:
+            Proxy.from_str(proxy=raw_proxy)
+        except (TypeError, ValueError):
+            return f'invalid proxy {raw_proxy}'
+
+    path = f'sessions/{session_name}.session'
+    if not os.path.isfile(path):
+        return f'{path} not found'
+    try:
+        with sqlite3.connect(f'file:{path}?mode=ro', uri=True) as connection:
+            auth_key = connection.execute('SELECT auth_key FROM sessions').fetchone()
+    except sqlite3.Error as error:
+        return f'unreadable session file: {error}'
+    if not auth_key or not auth_key[0]:
+        return 'session is not authorized'
+
+
+async def import_sessions(path: str) -> None:
+    if not os.path.isfile(path):
+        logger.warning(f"File {path} not found")
+        return
+
+    accounts = read_accounts_file(path)
+    new_accounts = {}
+    already_added = 0
+    for account in accounts:
+        # JSONL rows may hold null or numbers instead of a name
+        session_name = str(account.get('session_name') or '').strip().removesuffix('.session')
+        if not session_name:
+            logger.warning(f"Skipped row without session name: {account}")
+        elif session_name in account_store:
+            already_added += 1
+        else:
+            new_accounts[session_name] = {**account, 'session_name': session_name}
+
+    errors = await asyncio.gather(*(asyncio.to_thread(check_account, account) for account in new_accounts.values()))
+
+    imported = 0
+    with account_store.batch():
+        for account, error in zip(new_accounts.values(), errors):
+            if error:
+                logger.warning(f"{account['session_name']} | Skipped: {error}")
+                continue
+            new_account = {
+                "session_name": account['session_name'],
+                "user_agent": account.get('user_agent') or generate_random_user_agent(device_type='android',
+                                                                                      browser_type='chrome'),
+                "proxy": account.get('proxy') or ""
+            }
+            if account.get('fallback_proxies'):
+                new_account['fallback_proxies'] = account['fallback_proxies']
+            account_store.add(new_account)
+            imported += 1
+
+    logger.success(f"Imported <e>{imported}</e> of <e>{len(accounts)}</e> account/s from {path} "
+                   f"| Already added: <e>{already_added}</e>")
@@ -0,0 +1,181 @@
+import asyncio
+import base64
+import json
+import random
+from collections import Counter
+from time import time
+from urllib.parse import quote
+
+from aiohttp import web
+
+
+def encode_token(payload: dict) -> str:
+    def encode(data: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip('=')
+    return f"{encode({'alg': 'HS256', 'typ': 'JWT'})}.{encode(payload)}.mock"
+
+
+class FakeTGSession:
+    def __init__(self, session_name: str, latency: float = 0.2):
+        self.session_name = session_name
+        self.start_param = ''
+        self.name = session_name
+        self.latency = latency
+
+    async def get_tg_web_data(self) -> str:
+        await asyncio.sleep(self.latency * random.uniform(0.5, 1.5))
+        user = quote(json.dumps({'id': abs(hash(self.session_name)), 'first_name': self.session_name}))
+        return f'query_id=AA{self.session_name}&user={user}&auth_date={int(time())}&hash=mock'
+
+    async def join_tg_channel(self, channel: str) -> None:
+        await asyncio.sleep(self.latency)
+
+    async def change_tg_nickname(self, name: str) -> None:
+        await asyncio.sleep(self.latency)
+        self.name = name
+
+
+class MockPawsServer:
+    def __init__(self, latency: float = 0.05, error_rate: float = 0.0, quests: int = 10, captcha_delay: float = 10):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.quests = [{
+            '_id': f'mock{index:020d}',
+            'title': f'Mock quest {index}',
+            'code': 'mock',
+            'type': None,
+            'flag': 0,
+            'partner': True,
+            'data': None,
+            'counter': 0,
+            'sort': index,
+            'rewards': [{'amount': 1000}],
+        } for index in range(quests)]
+        self.captcha_delay = captcha_delay
+        self.users: dict[str, dict] = {}
+        self.captchas: dict[str, float] = {}
+        self.requests = Counter()
+        self.errors = Counter()
+        self.runner: web.AppRunner | None = None
+
+    @web.middleware
+    async def inject(self, request: web.Request, handler):
+        self.requests[request.path] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency * random.uniform(0.5, 1.5))
+        if random.random() < self.error_rate:
+            self.errors[request.path] += 1
+            raise web.HTTPInternalServerError(text='injected error')
+        return await handler(request)
+
+    def get_user(self, request: web.Request) -> dict:
+        token = request.headers.get('Authorization', '').removeprefix('Bearer ')
+        user = self.users.get(token)
+        if user is None:
+            raise web.HTTPUnauthorized(text='invalid token')
+        return user
+
+    async def auth(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        user_id = payload['data'].partition('&')[0]
+        token = encode_token({'sub': user_id, 'exp': int(time()) + 3600})
+        user = next((user for user in self.users.values() if user['_id'] == user_id), None)
+        if user is None:
+            user = {'_id': user_id, 'gameData': {'balance': 0}, 'userData': {},
+                    'completed': set(), 'claimed': set(), 'activity': False}
+        self.users[token] = user
+        return web.json_response({'success': True, 'data': [token, self.user_info(user)]})
+
+    @staticmethod
+    def user_info(user: dict) -> dict:
+        return {'_id': user['_id'], 'gameData': user['gameData'], 'userData': user['userData']}
+
+    async def user(self, request: web.Request) -> web.Response:
+        return web.json_response({'success': True, 'data': self.user_info(self.get_user(request))})
+
+    async def quests_list(self, request: web.Request) -> web.Response:
+        user = self.get_user(request)
+        quests = [{**quest, 'progress': {
+            'current': int(quest['_id'] in user['completed']),
+            'total': 1,
+            'status': 'claimable' if quest['_id'] in user['completed'] else 'start',
+            'claimed': quest['_id'] in user['claimed'],
+        }} for quest in self.quests]
+        return web.json_response({'success': True, 'data': quests})
+
+    async def quests_completed(self, request: web.Request) -> web.Response:
+        user = self.get_user(request)
+        user['completed'].add((await request.json())['questId'])
+        return web.json_response({'success': True, 'data': True})
+
+    async def quests_claim(self, request: web.Request) -> web.Response:
+        user = self.get_user(request)
+        quest_id = (await request.json())['questId']
+        if quest_id not in user['completed'] or quest_id in user['claimed']:
+            return web.json_response({'success': False, 'data': None})
+        user['claimed'].add(quest_id)
+        user['gameData']['balance'] += 1000
+        return web.json_response({'success': True, 'data': {'amount': 1000}})
+
+    async def quests_custom(self, request: web.Request) -> web.Response:
+        self.get_user(request)
+        return web.json_response({'success': True, 'data': {'completed': True}})
+
+    async def referrals(self, request: web.Request) -> web.Response:
+        self.get_user(request)
+        return web.json_response({'success': True, 'data': []})
+
+    async def eligibility(self, request: web.Request) -> web.Response:
+        user = self.get_user(request)
+        return web.json_response({'success': True, 'data': [
+            {'criteriaName': 'activityCheck', 'meetsCriteria': user['activity'], 'type': 'activity',
+             'requiredValue': True, 'userValue': user['activity']},
+            {'criteriaName': 'balance', 'meetsCriteria': user['gameData']['balance'] >= 5000, 'type': 'balance',
+             'requiredValue': 5000, 'userValue': user['gameData']['balance']},
+        ]})
+
+    async def activity(self, request: web.Request) -> web.Response:
+        user = self.get_user(request)
+        user['activity'] = bool((await request.json()).get('recaptchaToken'))
+        return web.json_response({'success': True, 'data': user['activity']})
+
+    async def captcha_in(self, request: web.Request) -> web.Response:
+        captcha_id = str(len(self.captchas) + 1)
+        self.captchas[captcha_id] = time() + self.captcha_delay
+        return web.Response(text=f'OK|{captcha_id}')
+
+    async def captcha_res(self, request: web.Request) -> web.Response:
+        if request.query.get('action') == 'getbalance':
+            return web.Response(text='100')
+
+        def answer(captcha_id: str) -> str:
+            return 'CAPCHA_NOT_READY' if self.captchas.get(captcha_id, 0) > time() else f'mock-token-{captcha_id}'
+
+        if request.query.get('action') == 'get':
+            return web.Response(text='|'.join(answer(captcha_id) for captcha_id in request.query['ids'].split(',')))
+        result = answer(request.query['id'])
+        return web.Response(text=result if result == 'CAPCHA_NOT_READY' else f'OK|{result}')
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        app = web.Application(middlewares=[self.inject])
+        app.router.add_post('/v1/user/auth', self.auth)
+        app.router.add_get('/v1/user', self.user)
+        app.router.add_post('/v1/user/activity', self.activity)
+        app.router.add_get('/v1/quests/list', self.quests_list)
+        app.router.add_post('/v1/quests/completed', self.quests_completed)
+        app.router.add_post('/v1/quests/claim', self.quests_claim)
+        app.router.add_post('/v1/quests/custom', self.quests_custom)
+        app.router.add_get('/v1/referral/my', self.referrals)
+        app.router.add_get('/v1/eligibility', self.eligibility)
+        app.router.add_post('/in.php', self.captcha_in)
+        app.router.add_get('/res.php', self.captcha_res)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host=host, port=port)
+        await site.start()
+        port = self.runner.addresses[0][1]
+        return f'http://{host}:{port}'
+
+    async def stop(self) -> None:
+        if self.runner is not None:
+            await self.runner.cleanup()
@@ -0,0 +1,133 @@
+import asyncio
+from dataclasses import dataclass
+from time import monotonic, time
+
+from bot.config import settings
+from bot.core.http_client import HttpClient
+from bot.core.rate_limiter import get_proxy_label
+from bot.utils import logger
+
+
+@dataclass
+class ProxyHealth:
+    latency: float | None = None
+    exit_ip: str | None = None
+    failures: int = 0
+    total_failures: int = 0
+    checks: int = 0
+    checked_at: float = 0
+
+    @property
+    def is_alive(self) -> bool:
+        return self.failures < settings.PROXY_MAX_FAILURES
+
+    @property
+    def score(self) -> float:
+        # 0 for a dead proxy, otherwise the share of successful checks discounted by latency
+        if not self.is_alive or not self.checks:
+            return 0
+        return (1 - self.total_failures / self.checks) / (1 + (self.latency or 0))
+
+
+class ProxyProber:
+    def __init__(self):
+        self.health: dict[str, ProxyHealth] = {}
+        self.outage = False
+
+    def is_alive(self, proxy: str | None) -> bool:
+        health = self.health.get(proxy) if proxy and not self.outage else None
+        return health is None or health.is_alive
+
+    async def probe(self, proxy: str) -> ProxyHealth:
+        health = self.health.setdefault(proxy, ProxyHealth())
+        http_client = HttpClient(headers={}, proxy=proxy)
+        started = monotonic()
+        try:
+            response = await http_client.get(url='https://api.botprod.ru/ip', timeout=settings.PROXY_CHECK_TIMEOUT)
+            response.raise_for_status()
+            latency = monotonic() - started
+            # exponential moving average keeps a single slow check from flipping the score
+            health.latency = latency if health.latency is None else 0.7 * health.latency + 0.3 * latency
+            health.exit_ip = response.text.strip()
+            health.failures = 0
+        except Exception as error:
+            health.failures += 1
+            health.total_failures += 1
+            logger.warning(f"Proxy <y>{get_proxy_label(proxy)}</y> | Check failed "
+                           f"(<e>{health.failures}</e> in a row): {error or type(error).__name__}")
+        finally:
+            health.checks += 1
+            health.checked_at = time()
+            await http_client.close()
+        return health
+
+    async def probe_all(self, proxies) -> None:
+        semaphore = asyncio.Semaphore(settings.PROXY_CHECK_CONCURRENCY)
+
+        async def probe(proxy: str) -> None:
+            async with semaphore:
+                await self.probe(proxy)
+
+        probed = {proxy for proxy in proxies if proxy}
+        await asyncio.gather(*(probe(proxy) for proxy in probed))
+        # when every proxy fails the same round the IP service is the likely culprit, nobody is deferred
+        self.outage = bool(probed) and all(self.health[proxy].failures for proxy in probed)
+        if self.outage:
+            logger.warning(f"Proxies checked | All <e>{len(probed)}</e> checks failed, "
+                           f"treating it as an outage of the check service")
+            return
+        alive = sum(health.is_alive for health in self.health.values())
+        logger.info(f"Proxies checked | Alive: <e>{alive}</e>/<e>{len(self.health)}</e>")
+
+    def log_scores(self) -> None:
+        for proxy, health in sorted(self.health.items(), key=lambda item: -item[1].score):
+            latency = f'{health.latency:.2f}s' if health.latency is not None else '-'
+            logger.info(f"Proxy <y>{get_proxy_label(proxy)}</y> | IP: <lc>{health.exit_ip}</lc> "
+                        f"| Latency: <e>{latency}</e> | Failures: <e>{health.total_failures}</e>/<e>{health.checks}</e> "
+                        f"| Score: <e>{health.score:.2f}</e>")
+
+    async def run(self, interval: int) -> None:
+        while True:
+            await asyncio.sleep(delay=interval)
+            await self.probe_all(list(self.health))
+
+
+proxy_prober = ProxyProber()
+
+
+class ProxyPool:
+    def __init__(self, proxies: list[str | None], session_name: str = ''):
+        self.proxies = proxies or [None]
+        self.session_name = session_name
+        self.index = 0
+        self.failures = 0
+
+    @property
+    def proxy(self) -> str | None:
+        return self.proxies[self.index]
+
+    def switch(self) -> bool:
+        for offset in range(1, len(self.proxies)):
+            index = (self.index + offset) % len(self.proxies)
+            if proxy_prober.is_alive(self.proxies[index]):
+                logger.warning(f"{self.session_name} | Switching proxy <y>{get_proxy_label(self.proxy)}</y> "
+                               f"-> <y>{get_proxy_label(self.proxies[index])}</y>")
+                self.index = index
+                self.failures = 0
+                return True
+        return False
+
+    def ensure_alive(self) -> bool:
+        return proxy_prober.is_alive(self.proxy) or self.switch()
+
+    def report_success(self, latency: float) -> None:
+        if latency > settings.PROXY_MAX_LATENCY:
+            self.report_failure()
+        else:
+            self.failures = 0
+
+    def report_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= settings.PROXY_FAILOVER_ERRORS:
+            self.switch()
+            self.failures = 0
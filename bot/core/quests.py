@@ -0,0 +1,237 @@
+import random
+import re
+from dataclasses import dataclass
+from enum import Enum, auto
+from random import randint
+from time import time
+from typing import Any, Awaitable, Callable
+
+import msgspec
+
+from bot.config import settings
+from bot.core.schemas import Progress, QuestInfo
+from bot.utils import logger
+
+
+class QuestAction(Enum):
+    SKIP = auto()  # quest is not available for the account, go to the next one
+    DONE = auto()  # handler did all the work itself, nothing to claim
+    VERIFY = auto()  # verify the quest with default data and claim the reward
+    STOP = auto()  # stop processing quests for this cycle
+
+
+QuestHandler = Callable[..., Awaitable[QuestAction]]
+
+quest_handlers: dict[tuple[str, str | None], QuestHandler] = {}
+
+# quest ids that are never processed
+excluded_quests = {"679bc06e70efab8b96d0efdf"}
+
+# telegram and invite quests are handled by their own handlers even when marked as partner quests
+non_simple_codes = {'telegram', 'invite'}
+
+title_tags = re.compile(r'<[^>]+>')
+
+
+def quest_handler(code: str, quest_type: str | None = None):
+    def decorator(handler: QuestHandler) -> QuestHandler:
+        quest_handlers[(code, quest_type)] = handler
+        return handler
+    return decorator
+
+
+@dataclass(frozen=True)
+class Quest:
+    id: str
+    code: str
+    type: str | None
+    flag: int
+    title: str
+    data: Any
+    counter: int
+    rewards: list[dict]
+    available_until: float
+    is_excluded: bool
+    handler: QuestHandler
+
+    @property
+    def is_expired(self) -> bool:
+        return self.available_until < time() * 1000
+
+
+# quest id -> (definition key, quest), only quests of the latest list are kept
+quests_cache: dict[str, tuple[tuple, Quest]] = {}
+
+
+def get_handler_key(task: QuestInfo) -> tuple[str, str | None]:
+    code = task.code
+    if code not in non_simple_codes and task.flag == 0 and (code in settings.SIMPLE_TASKS or task.partner):
+        return 'simple', None
+    if code == 'website-blank' and task.flag == 0 and task.id in settings.WEB_TASKS:
+        return 'website-blank', 'web'
+    return code, task.type
+
+
+def get_quest(task: QuestInfo) -> Quest:
+    key = (task.code, task.type, task.flag, task.title, task.available_until, task.partner, task.counter,
+           msgspec.json.encode(task.data), msgspec.json.encode(task.rewards))
+    cached = quests_cache.get(task.id)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    code, quest_type = get_handler_key(task)
+    quest = Quest(id=task.id,
+                  code=task.code,
+                  type=task.type,
+                  flag=task.flag,
+                  title=title_tags.sub('', task.title),
+                  data=task.data,
+                  counter=task.counter,
+                  rewards=task.rewards,
+                  available_until=task.available_until,
+                  is_excluded=task.code in settings.DISABLED_TASKS or task.id in excluded_quests,
+                  handler=quest_handlers.get((code, quest_type)) or quest_handlers.get((code, None))
+                  or unrecognized_quest)
+    quests_cache[task.id] = (key, quest)
+    return quest
+
+
+def prune_quests(tasks: list[QuestInfo]) -> None:
+    ids = {task.id for task in tasks}
+    for quest_id in quests_cache.keys() - ids:
+        del quests_cache[quest_id]
+
+
+async def unrecognized_quest(tapper, http_client, quest: Quest, progress: Progress, tg_web_data: str) -> QuestAction:
+    logger.info(f"{tapper.session_name} | Unrecognized task: <lc>{quest.title}</lc>")
+    return QuestAction.SKIP
+
+
+@quest_handler('telegram')
+async def telegram_quest(tapper, http_client, quest: Quest, progress: Progress, tg_web_data: str) -> QuestAction:
+    if quest.flag == 0:
+        logger.info(f"{tapper.session_name} | Performing TG task <lc>{quest.title}</lc>")
+    else:
+        if quest.type == 'partner-app' or not settings.JOIN_TG_CHANNELS:
+            return QuestAction.SKIP
+
+        logger.info(f"{tapper.session_name} | Performing TG subscription to <lc>{quest.data}</lc>")
+        await tapper.tg_session.join_tg_channel(quest.data)
+    return QuestAction.VERIFY
+
+
+@quest_handler('invite')
+async def invite_quest(tapper, http_client, quest: Quest, progress: Progress, tg_web_data: str) -> QuestAction:
+    referrals = await tapper.get_referrals(http_client)
+    if quest.counter > len(referrals):
+        return QuestAction.SKIP
+    return QuestAction.VERIFY
+
+
+@quest_handler('simple')
+async def simple_quest(tapper, http_client, quest: Quest, progress: Progress, tg_web_data: str) -> QuestAction:
+    logger.info(f"{tapper.session_name} | Performing <lc>{quest.title}</lc> task")
+    return QuestAction.VERIFY
+
+
+@quest_handler('daily')
+@quest_handler('custom')
+async def daily_quest(tapper, http_client, quest: Quest, progress: Progress, tg_web_data: str) -> QuestAction:
+    if quest.is_expired:
+        return QuestAction.SKIP
+    if quest.id != "678556b8ed515bd1fbea8147" or progress.status == 'waiting':
+        return QuestAction.SKIP
+    logger.info(f"{tapper.session_name} | Performing <lc>{quest.title}</lc> task")
+    result = await tapper.verify_task(http_client, quest.id, None)
+    if result:
+        logger.success(f"{tapper.session_name} | Task <lc>{quest.title}</lc> completed | Waiting to claim")
+    return QuestAction.DONE
+
+
+@quest_handler('wallet')
+async def wallet_quest(tapper, http_client, quest: Quest, progress: Progress, tg_web_data: str) -> QuestAction:
+    if tapper.wallet is not None and len(tapper.wallet) > 0:
+        logger.info(f"{tapper.session_name} | Performing wallet task: <lc>{quest.title}</lc>")
+        return QuestAction.VERIFY
+    return QuestAction.SKIP
+
+
+@quest_handler('custom1', 'soll-wallet')
+async def solana_wallet_quest(tapper, http_client, quest: Quest, progress: Progress, tg_web_data: str) -> QuestAction:
+    if tapper.solana_wallet is not None and len(tapper.solana_wallet) > 0 and not quest.is_expired:
+        logger.info(f"{tapper.session_name} | Performing Solana wallet task: <lc>{quest.title}</lc>")
+        return QuestAction.VERIFY
+    return QuestAction.SKIP
+
+
+@quest_handler('emojiName')
+async def emoji_name_quest(tapper, http_client, quest: Quest, progress: Progress, tg_web_data: str) -> QuestAction:
+    logger.info(f"{tapper.session_name} | Performing <lc>{quest.title}</lc> task")
+    if '🐾' not in tapper.tg_session.name:
+        nickname = f'{tapper.tg_session.name}🐾'
+        await tapper.tg_session.change_tg_nickname(name=nickname)
+        return QuestAction.SKIP
+    return QuestAction.VERIFY
+
+
+@quest_handler('touches')
+async def touches_quest(tapper, http_client, quest: Quest, progress: Progress, tg_web_data: str) -> QuestAction:
+    if not quest.is_expired:
+        logger.info(f"{tapper.session_name} | Performing <lc>{quest.title}</lc> task")
+        additional_data = {
+            'timestamp': int(time() * 1000),
+            'x': round(random.uniform(150, 400), randint(9, 10)),
+            'y': round(random.uniform(300, 500), randint(9, 10))
+        }
+        result = await tapper.verify_task(http_client, quest.id, additional_data)
+        if result is not None:
+            logger.success(f"{tapper.session_name} | Task <lc>{quest.title}</lc> verified!")
+    return QuestAction.DONE
+
+
+@quest_handler('website-blank', 'web')
+async def web_quest(tapper, http_client, quest: Quest, progress: Progress, tg_web_data: str) -> QuestAction:
+    if quest.is_expired:
+        return QuestAction.SKIP
+
+    logger.info(f"{tapper.session_name} | Performing <lc>{quest.title}</lc> task")
+    result = await tapper.perform_web_task(http_client=http_client, tg_web_data=tg_web_data, task_id=quest.id)
+    if result:
+        logger.success(f"{tapper.session_name} | Task <lc>{quest.title}</lc> verified!")
+    return QuestAction.STOP
+
+
+@quest_handler('website-blank', 'walletConnect')
+async def wallet_connect_quest(tapper, http_client, quest: Quest, progress: Progress, tg_web_data: str) -> QuestAction:
+    logger.info(f"{tapper.session_name} | Performing <lc>{quest.title}</lc> task")
+    if tapper.ton_proof and tapper.sol_proof:
+        additional_data = {
+            'timestamp': int(time() * 1000),
+            'x': -1,
+            'y': -1
+        }
+        result = await tapper.verify_task(http_client, quest.id, additional_data)
+        if result is not None:
+            logger.success(f"{tapper.session_name} | Task <lc>{quest.title}</lc> completed!")
+    else:
+        logger.info(f"{tapper.session_name} | Can't complete <lc>{quest.title}</lc> task "
+                    f"| Connected wallets: Ton - <e>{tapper.ton_proof}</e>, "
+                    f"Solana - <e>{tapper.sol_proof}</e>")
+    return QuestAction.DONE
+
+
+@quest_handler('website-blank', 'pwa')
+async def pwa_quest(tapper, http_client, quest: Quest, progress: Progress, tg_web_data: str) -> QuestAction:
+    if quest.id != "678a9cc119aff2d170842b10":
+        return QuestAction.SKIP
+    logger.info(f"{tapper.session_name} | Performing <lc>{quest.title}</lc> custom task")
+    result = await tapper.perform_custom_task(http_client, quest.id)
+    if result:
+        logger.success(f"{tapper.session_name} | Task <lc>{quest.title}</lc> verified! "
+                       f"| Claim reward in next cycle")
+    return QuestAction.DONE
+
+
+@quest_handler('website-blank')
+async def website_quest(tapper, http_client, quest: Quest, progress: Progress, tg_web_data: str) -> QuestAction:
+    return QuestAction.SKIP
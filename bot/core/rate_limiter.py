@@ -0,0 +1,94 @@
+import asyncio
+import random
+from time import monotonic
+from urllib.parse import urlsplit
+
+from bot.config import settings
+from bot.utils import logger
+
+
+# tokens are reserved up front, so waiters are served in order
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = 1, jitter: tuple[float, float] = (0, 0)):
+        self.rate = rate
+        self.capacity = capacity
+        self.jitter = jitter
+        self.tokens = capacity
+        self.updated = monotonic()
+        self.waiting = 0
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def reserve(self) -> float:
+        if self.rate <= 0:
+            return 0
+        now = monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        wait = 0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+        self.tokens -= 1
+        return wait
+
+    async def acquire(self) -> float:
+        delay = self.reserve() + random.uniform(*self.jitter)
+        self.acquired += 1
+        self.total_wait += delay
+        self.max_wait = max(self.max_wait, delay)
+        if delay > 0:
+            self.waiting += 1
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self.waiting -= 1
+        return delay
+
+    def reset_stats(self) -> None:
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+def get_proxy_label(proxy: str | None) -> str:
+    if not proxy:
+        return 'direct'
+    parts = urlsplit(proxy)
+    return f'{parts.hostname}:{parts.port}' if parts.hostname else proxy
+
+
+# buckets live in one process, direct connections get `direct_share` of the rate when workers share the IP
+class RateLimiter:
+    def __init__(self):
+        self.buckets: dict[tuple[str, str | None], TokenBucket] = {}
+        self.direct_share = 1.0
+
+    def get_bucket(self, host: str, proxy: str | None) -> TokenBucket:
+        bucket = self.buckets.get((host, proxy))
+        if bucket is None:
+            rate = settings.RATE_LIMITS.get(host, settings.RATE_LIMIT_DEFAULT)
+            if proxy is None:
+                rate *= self.direct_share
+            bucket = TokenBucket(rate=rate, capacity=settings.RATE_LIMIT_BURST)
+            self.buckets[(host, proxy)] = bucket
+        return bucket
+
+    async def acquire(self, url: str, proxy: str | None = None) -> float:
+        return await self.get_bucket(urlsplit(url).hostname, proxy).acquire()
+
+    def log_stats(self) -> None:
+        for (host, proxy), bucket in sorted(self.buckets.items(), key=lambda item: -item[1].total_wait):
+            if not bucket.acquired and not bucket.waiting:
+                continue
+            avg_wait = bucket.total_wait / bucket.acquired if bucket.acquired else 0
+            logger.info(f"Rate limiter | <lc>{host}</lc> via <y>{get_proxy_label(proxy)}</y> "
+                        f"| Requests: <e>{bucket.acquired}</e>, Queue: <e>{bucket.waiting}</e>, "
+                        f"Avg wait: <e>{avg_wait:.2f}</e>s, Max wait: <e>{bucket.max_wait:.2f}</e>s")
+            bucket.reset_stats()
+
+    async def report(self, interval: int) -> None:
+        while True:
+            await asyncio.sleep(delay=interval)
+            self.log_stats()
+
+
+rate_limiter = RateLimiter()
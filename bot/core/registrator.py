@@ -3,7 +3,7 @@ from pyrogram import Client
 from bot.config import settings
 from bot.core.agents import generate_random_user_agent
 from bot.utils import logger
-from bot.utils.file_manager import save_to_json
+from bot.utils.account_store import account_store
 
 
 async def register_sessions() -> None:
@@ -24,12 +24,12 @@ async def register_sessions() -> None:
         user_data = await session.get_me()
 
     user_agent = generate_random_user_agent(device_type='android', browser_type='chrome')
-    save_to_json(f'sessions/accounts.json',
-                 dict_={
-                     "session_name": session_name,
-                     "user_agent": user_agent,
-                     "proxy": raw_proxy if raw_proxy else ""
-                 })
+    with account_store.batch():
+        account_store.add({
+            "session_name": session_name,
+            "user_agent": user_agent,
+            "proxy": raw_proxy if raw_proxy else ""
+        })
     logger.success(f'Session added successfully @{user_data.username} | {user_data.first_name} {user_data.last_name}')
 
 
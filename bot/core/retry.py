@@ -0,0 +1,49 @@
+import asyncio
+import functools
+from random import uniform
+
+from bot.config import settings
+from bot.core.circuit_breaker import retryable_statuses
+from bot.core.http_client import proxy_errors
+from bot.exceptions import CircuitOpen, HttpError
+from bot.utils import logger
+from bot.utils.metrics import retries
+
+
+def get_backoff(attempt: int, base: float, cap: float) -> float:
+    # full jitter, accounts that failed together don't retry together
+    return uniform(0, min(cap, base * 2 ** attempt))
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, HttpError):
+        return error.status_code in retryable_statuses
+    return isinstance(error, proxy_errors)
+
+
+def with_retry(operation: str, description: str):
+    # the call returns None once it gives up, an open circuit fails it at once
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, max_retries: int | None = None, **kwargs):
+            max_retries = settings.RETRY_ATTEMPTS if max_retries is None else max_retries
+            attempt = 0
+            while True:
+                try:
+                    return await func(self, *args, **kwargs)
+                except CircuitOpen as error:
+                    self.circuit_wait = max(self.circuit_wait, error.retry_after)
+                    logger.warning(f"{self.session_name} | Can't {description} | {error}")
+                    return None
+                except Exception as error:
+                    if attempt >= max_retries or not is_retryable(error):
+                        logger.error(f"{self.session_name} | Unknown error when {description}: {error}")
+                        return None
+                    delay = get_backoff(attempt, settings.RETRY_BASE_DELAY, settings.RETRY_MAX_DELAY)
+                    attempt += 1
+                    retries.inc(operation)
+                    logger.warning(f"{self.session_name} | Can't {description} | Retry attempt: {attempt} "
+                                   f"in <y>{delay:.1f}</y> sec")
+                    await asyncio.sleep(delay=delay)
+        return wrapper
+    return decorator
@@ -0,0 +1,75 @@
+import asyncio
+import heapq
+import itertools
+from time import time
+
+from bot.config import settings
+from bot.core.proxy_prober import proxy_prober
+from bot.core.tapper import Tapper
+from bot.exceptions import InvalidSession
+from bot.utils import logger
+
+
+class Scheduler:
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.deadlines: list[tuple[float, int, Tapper]] = []
+        self.counter = itertools.count()
+        self.ready: asyncio.Queue[Tapper] = asyncio.Queue()
+        self.wakeup = asyncio.Event()
+        self.active = 0
+
+    def schedule(self, tapper: Tapper, delay: float) -> None:
+        heapq.heappush(self.deadlines, (time() + delay, next(self.counter), tapper))
+        self.wakeup.set()
+
+    @property
+    def is_finished(self) -> bool:
+        return not self.deadlines and self.ready.empty() and self.active == 0
+
+    async def dispatch(self) -> None:
+        while not self.is_finished:
+            self.wakeup.clear()
+            timeout = self.deadlines[0][0] - time() if self.deadlines else None
+            if timeout is not None and timeout <= 0:
+                _, _, tapper = heapq.heappop(self.deadlines)
+                self.ready.put_nowait(tapper)
+                continue
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def worker(self) -> None:
+        while True:
+            tapper = await self.ready.get()
+            self.active += 1
+            try:
+                if not tapper.proxy_pool.ensure_alive() and not settings.PROXY_CHECK_INTERVAL:
+                    # without background checks the proxy is probed again here
+                    await proxy_prober.probe(tapper.proxy)
+                if not tapper.proxy_pool.ensure_alive():
+                    delay = settings.PROXY_CHECK_INTERVAL or settings.PROXY_CHECK_TIMEOUT
+                    logger.warning(f"{tapper.session_name} | Proxy is not responding, "
+                                   f"deferring for <y>{delay}</y> sec")
+                    self.schedule(tapper, delay)
+                    continue
+                delay = await tapper.run_cycle()
+                self.schedule(tapper, delay)
+            except InvalidSession:
+                logger.error(f"{tapper.session_name} | Invalid Session")
+                tapper.set_state('stopped')
+            except Exception as error:
+                logger.error(f"{tapper.session_name} | Unknown error: {error}")
+                self.schedule(tapper, tapper.get_failure_delay())
+            finally:
+                self.active -= 1
+                self.wakeup.set()
+
+    async def run(self) -> None:
+        workers = [asyncio.create_task(self.worker()) for _ in range(self.workers)]
+        try:
+            await self.dispatch()
+        finally:
+            for worker in workers:
+                worker.cancel()
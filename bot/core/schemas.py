@@ -0,0 +1,68 @@
+from typing import Any, Generic, TypeVar
+
+import msgspec
+
+T = TypeVar('T')
+
+
+class Schema(msgspec.Struct, rename='camel', gc=False):
+    pass
+
+
+class ApiResponse(Schema, Generic[T]):
+    success: bool = False
+    data: T | None = None
+
+
+class GameData(Schema):
+    balance: int | float = 0
+
+
+class UserData(Schema):
+    wallet: str | None = None
+    solana_wallet: str | None = None
+    proof_ton_wallet: str | None = None
+    proof_solana_wallet: str | None = None
+
+
+class UserInfo(Schema):
+    id: str = msgspec.field(name='_id')
+    game_data: GameData
+    user_data: UserData
+    grinch_removed: bool | None = None
+
+
+class Progress(Schema):
+    current: int
+    total: int
+    status: str
+    claimed: bool = False
+
+
+class QuestInfo(Schema):
+    id: str = msgspec.field(name='_id')
+    title: str
+    code: str
+    progress: Progress
+    type: str | None = None
+    flag: int = 0
+    partner: bool = False
+    data: Any = None
+    counter: int = 0
+    sort: int = 999
+    rewards: list[dict] = []
+    available_until: float = 0
+
+
+class Criteria(Schema):
+    criteria_name: str
+    meets_criteria: bool
+    type: str
+    required_value: Any = None
+    user_value: Any = None
+
+
+auth_decoder = msgspec.json.Decoder(ApiResponse[tuple[str, UserInfo]])
+user_decoder = msgspec.json.Decoder(ApiResponse[UserInfo])
+quests_decoder = msgspec.json.Decoder(ApiResponse[list[QuestInfo]])
+eligibility_decoder = msgspec.json.Decoder(ApiResponse[list[Criteria]])
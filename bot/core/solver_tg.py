@@ -1,22 +1,15 @@
-import requests
-import json
+import asyncio
 import time
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
 
+import aiohttp
 
-def Session():
-    session = requests.Session()
-    retry = Retry(connect=5, backoff_factor=1)
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount('http://', adapter)
-    session.mount('https://', adapter)
-    return session
+from bot.config import settings
+from bot.core.rate_limiter import rate_limiter
 
 
-class Api_GXP:
-    def __init__(self):
-        self.url = "http://api.sctg.xyz"
+class AsyncApi_GXP:
+    def __init__(self, key: str = "APIKEY"):
+        self.url = settings.CAPTCHA_API_URL
 
         # Здесь надо указать ваш APIKEY с https://t.me/Xevil_check_bot
         # Сервис так же поддерживает передачу дополнительных параметров в apikey
@@ -27,45 +20,108 @@ class Api_GXP:
         # APIKEY|offfast
         # Так же можно одновременно:
         # APIKEY|onlyxevil|offfast
-        self.key = "APIKEY"
+        self.key = key
         self.max_wait = 300
         self.sleep = 5
+        self.balance_ttl = 60
+        self.batch_size = 100
+        self._session = None
+        self._pending: dict[str, asyncio.Future] = {}
+        self._poller = None
+        self._balance = None
+        self._balance_time = 0.0
+        self._balance_lock = asyncio.Lock()
 
-    def in_api(self, data):
-        session = Session()
-        params = {"key": (None, self.key)}
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=False),
+                                                  timeout=aiohttp.ClientTimeout(total=15))
+        return self._session
+
+    async def in_api(self, data) -> str:
+        form = aiohttp.FormData()
+        form.add_field("key", self.key)
         for key in data:
-            params[key] = (None, data[key])
-        return session.post(self.url + '/in.php', files=params, verify=False, timeout=15)
-
-    def res_api(self, api_id):
-        session = Session()
-        params = {"key": self.key, "id": api_id}
-        return session.get(self.url + '/res.php', params=params, verify=False, timeout=15)
-
-    def get_balance(self):
-        session = Session()
-        params = {"key": self.key, "action": "getbalance"}
-        return session.get(self.url + '/res.php', params=params, verify=False, timeout=15).text
-
-    def run(self, data):
-
-        get_in = self.in_api(data)
-        if get_in:
-            if "|" in get_in.text:
-                api_id = get_in.text.split("|")[1]
-            else:
-                return get_in.text
+            form.add_field(key, data[key])
+        await rate_limiter.acquire(self.url)
+        async with self.session.post(self.url + '/in.php', data=form) as response:
+            if response.status >= 400:
+                return "ERROR_CAPTCHA_UNSOLVABLE"
+            return await response.text()
+
+    async def res_api(self, api_ids: list[str]) -> list[str]:
+        if len(api_ids) == 1:
+            params = {"key": self.key, "id": api_ids[0]}
         else:
-            return "ERROR_CAPTCHA_UNSOLVABLE"
-        for i in range(self.max_wait // self.sleep):
-            time.sleep(self.sleep)
-            get_res = self.res_api(api_id)
-            if get_res:
-                answer = get_res.text
-                if 'CAPCHA_NOT_READY' in answer:
+            params = {"key": self.key, "action": "get", "ids": ",".join(api_ids)}
+        await rate_limiter.acquire(self.url)
+        async with self.session.get(self.url + '/res.php', params=params) as response:
+            response.raise_for_status()
+            answer = await response.text()
+
+        if len(api_ids) == 1:
+            return [answer.split("|")[1] if answer.startswith("OK|") else answer]
+        answers = answer.split("|")
+        if len(answers) != len(api_ids):
+            # service does not support bulk polling, ask for every id separately
+            return [(await self.res_api([api_id]))[0] for api_id in api_ids]
+        return answers
+
+    async def get_balance(self) -> str:
+        async with self._balance_lock:
+            if self._balance is None or time.time() - self._balance_time >= self.balance_ttl:
+                params = {"key": self.key, "action": "getbalance"}
+                await rate_limiter.acquire(self.url)
+                async with self.session.get(self.url + '/res.php', params=params) as response:
+                    self._balance = await response.text()
+                self._balance_time = time.time()
+            return self._balance
+
+    async def poll(self):
+        while self._pending:
+            await asyncio.sleep(self.sleep)
+            api_ids = list(self._pending)
+            for i in range(0, len(api_ids), self.batch_size):
+                chunk = api_ids[i:i + self.batch_size]
+                try:
+                    answers = await self.res_api(chunk)
+                except (aiohttp.ClientError, asyncio.TimeoutError):
                     continue
-                elif "|" in answer:
-                    return answer.split("|")[1]
-                else:
-                    return answer
+                for api_id, answer in zip(chunk, answers):
+                    if 'CAPCHA_NOT_READY' in answer:
+                        continue
+                    future = self._pending.pop(api_id, None)
+                    if future is not None and not future.done():
+                        future.set_result(answer)
+
+    async def run(self, data) -> str:
+        get_in = await self.in_api(data)
+        if "|" in get_in:
+            api_id = get_in.split("|")[1]
+        else:
+            return get_in
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[api_id] = future
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self.poll())
+        try:
+            return await asyncio.wait_for(future, timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            return "ERROR_CAPTCHA_UNSOLVABLE"
+        finally:
+            self._pending.pop(api_id, None)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
+async_solvers: dict[str, AsyncApi_GXP] = {}
+
+
+def get_async_solver(key: str) -> AsyncApi_GXP:
+    if key not in async_solvers:
+        async_solvers[key] = AsyncApi_GXP(key=key)
+    return async_solvers[key]
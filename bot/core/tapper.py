@@ -1,33 +1,55 @@
 import asyncio
 import base64
-import random
-import re
 import sys
 from time import time
 
 import cloudscraper
-from aiocfscrape import CloudflareScraper
-from aiohttp_proxy import ProxyConnector
 from better_proxy import Proxy
 from bot.config import settings
-from bot.core.solver_tg import Api_GXP
+from bot.core.http_client import HttpClient
+from bot.core.captcha_pool import captcha_pool
+from bot.core.proxy_prober import ProxyPool
+from bot.core.quests import Quest, QuestAction, get_quest, prune_quests
+from bot.core.rate_limiter import TokenBucket
 from bot.utils import logger
-from bot.exceptions import InvalidSession
-from .agents import get_sec_ch_ua, is_latest_tg_version
-from .headers import headers, web_headers
+from bot.exceptions import CircuitOpen, InvalidSession
+from .agents import is_latest_tg_version
+from .headers import build_header_profiles
+from .retry import get_backoff, with_retry
+from .schemas import Progress, UserInfo, auth_decoder, eligibility_decoder, quests_decoder, user_decoder
 
-from random import randint
+from random import randint, uniform
 
 from ..utils.api_checker import is_valid_endpoints
+from ..utils.metrics import accounts
+from ..utils.state_store import get_auth_date, get_token_expiry, is_token_valid, state_store
 from ..utils.tg_manager.TGSession import TGSession
 from bot.core.WalletManager.WalletManager import get_valid_wallet, set_wallet, verify_ton_wallet
 from bot.core.WalletManager.SolanaManager import get_solana_valid_wallet, set_solana_wallet, verify_solana_wallet
 
 
 class Tapper:
-    def __init__(self, tg_session: TGSession):
+    def __init__(self, tg_session: TGSession, user_agent: str, proxy: str | None,
+                 fallback_proxies: list[str] | None = None):
         self.tg_session = tg_session
         self.session_name = tg_session.session_name
+        self.user_agent = user_agent
+        self.proxy_pool = ProxyPool([proxy, *(fallback_proxies or [])], session_name=self.session_name)
+        self.app_headers, self.web_headers = build_header_profiles(user_agent)
+        self.access_token = None
+        self.access_token_created_time = 0
+        self.token_live_time = randint(3500, 3600)
+        self.token_restored = False
+        self.next_cycle_at = 0
+        self.failed_cycles = 0
+        self.circuit_wait = 0.0
+        self.state = 'sleeping'
+        accounts.inc(self.state)
+        self.tg_web_data = None
+        self.tg_auth_date = 0
+        self.tg_web_data_task: asyncio.Task | None = None
+        self.quest_limiter = TokenBucket(rate=settings.TASKS_RATE / 60, capacity=settings.TASKS_CONCURRENCY,
+                                         jitter=settings.TASKS_JITTER)
         self.start_param = ''
         self.name = ''
         self.wallet = ''
@@ -36,8 +58,76 @@ class Tapper:
         self.is_grinch = None
         self.sol_proof = False
         self.ton_proof = False
+        self.activity_missing = False
+
+    def set_state(self, state: str) -> None:
+        accounts.dec(self.state)
+        accounts.inc(state)
+        self.state = state
+
+    def set_access_token(self, access_token: str | None) -> None:
+        self.access_token = access_token
+        self.app_headers, self.web_headers = build_header_profiles(self.user_agent, access_token)
+
+    def get_failure_delay(self) -> int:
+        delay = settings.RETRY_CYCLE_DELAY + get_backoff(self.failed_cycles, settings.RETRY_CYCLE_DELAY,
+                                                         settings.RETRY_CYCLE_MAX_DELAY)
+        self.failed_cycles += 1
+        if self.circuit_wait:
+            # spread the accounts over the recovery ramp instead of releasing them at once
+            delay = max(delay, self.circuit_wait + uniform(0, settings.CIRCUIT_OPEN_TIME))
+        return round(delay)
+
+    @property
+    def proxy(self) -> str | None:
+        return self.proxy_pool.proxy
+
+    def restore_state(self, state: dict) -> None:
+        self.paws_id = state['paws_id'] or ''
+        self.wallet = state['wallet']
+        self.solana_wallet = state['solana_wallet']
+        self.ton_proof = bool(state['ton_proof'])
+        self.sol_proof = bool(state['sol_proof'])
+        self.activity_missing = bool(state['activity_missing'])
+        self.next_cycle_at = state['next_cycle_at'] or 0
+        self.tg_web_data = state['tg_web_data']
+        self.tg_auth_date = state['tg_auth_date'] or 0
+        if is_token_valid(state):
+            self.set_access_token(state['access_token'])
+            self.access_token_created_time = state['created_at']
+            # the same refresh window as a fresh login, not the whole JWT lifetime
+            self.token_live_time = min(randint(3500, 3600), state['expires_at'] - state['created_at'] - 300)
+            self.token_restored = True
+
+    @property
+    def tg_web_data_expires_at(self) -> float:
+        return self.tg_auth_date + settings.TG_WEB_DATA_TTL if self.tg_web_data else 0
+
+    async def refresh_tg_web_data(self) -> str | None:
+        tg_web_data = await self.tg_session.get_tg_web_data()
+        if tg_web_data is not None:
+            self.tg_web_data = tg_web_data
+            self.tg_auth_date = get_auth_date(tg_web_data) or time()
+            state_store.save(self.session_name, tg_web_data=tg_web_data, tg_auth_date=self.tg_auth_date)
+        return tg_web_data
+
+    async def get_tg_web_data(self, force: bool = False) -> str | None:
+        if self.tg_web_data_task is not None:
+            task, self.tg_web_data_task = self.tg_web_data_task, None
+            try:
+                await task
+            except Exception as error:
+                logger.warning(f"{self.session_name} | Background web data refresh failed: {error}")
+        if not force and time() < self.tg_web_data_expires_at:
+            return self.tg_web_data
+        return await self.refresh_tg_web_data()
+
+    def schedule_tg_web_data_refresh(self, sleep_time: int) -> None:
+        if self.tg_web_data_task is None and \
+                self.tg_web_data_expires_at < time() + sleep_time + settings.TG_WEB_DATA_REFRESH_MARGIN:
+            self.tg_web_data_task = asyncio.create_task(self.refresh_tg_web_data())
 
-    async def send_plausible_event(self, http_client: cloudscraper.CloudScraper, web_data: str, event_name='pageview'):
+    async def send_plausible_event(self, http_client: HttpClient, web_data: str, event_name='pageview'):
         try:
             payload = {
                 "d": "app.paws.community",
@@ -45,7 +135,7 @@ class Tapper:
                 "r": None,
                 "u": web_data
             }
-            response = http_client.post("https://plausible.io/api/event", json=payload)
+            response = await http_client.post("https://plausible.io/api/event", json=payload)
             if response.status_code == 202:
                 logger.success(
                     f'{self.session_name} | Sent plausible game event: <fg #008080>{event_name}</fg #008080>')
@@ -55,61 +145,30 @@ class Tapper:
         except:
             return False
 
-    async def login(self, http_client: cloudscraper.CloudScraper, tg_web_data: str, retry=0):
-        try:
-            payload = {'data': tg_web_data}
-            if self.tg_session.start_param:
-                payload['referralCode'] = self.tg_session.start_param
-
-            response = http_client.post("https://api.paws.community/v1/user/auth", json=payload,
-                                        timeout=60)
-
-            response.raise_for_status()
-            response_json = response.json()
-            auth_token = None
-            if response_json.get('success', False):
-                auth_token = response_json.get('data', None)
-            return auth_token
-
-        except Exception as error:
-            if retry < 3:
-                logger.warning(f"{self.session_name} | Can't logging | Retry attempt: {retry}")
-                await asyncio.sleep(delay=randint(5, 10))
-                return await self.login(http_client, tg_web_data=tg_web_data, retry=retry + 1)
+    @with_retry('login', 'logging')
+    async def login(self, http_client: HttpClient, tg_web_data: str):
+        payload = {'data': tg_web_data}
+        if self.tg_session.start_param:
+            payload['referralCode'] = self.tg_session.start_param
 
-            logger.error(f"{self.session_name} | Unknown error when logging: {error}")
-            await asyncio.sleep(delay=randint(3, 7))
+        response = await http_client.post(f"{settings.API_BASE_URL}/user/auth", json=payload,
+                                          timeout=60)
 
-    async def check_proxy(self, http_client: cloudscraper.CloudScraper, proxy: str) -> None:
-        try:
-            response = http_client.get(url='https://api.botprod.ru/ip', timeout=120)
-            ip = response.text
-            logger.info(f"{self.session_name} | Proxy IP: {ip}")
-        except Exception as error:
-            logger.error(f"{self.session_name} | Proxy: {proxy} | Error: {error}")
+        response.raise_for_status()
+        auth_response = response.decode(auth_decoder)
+        return auth_response.data if auth_response.success else None
 
-    async def get_all_tasks(self, http_client: cloudscraper.CloudScraper, retry=0):
-        try:
-            response = http_client.get(f"https://api.paws.community/v1/quests/list")
-            response.raise_for_status()
-            return response.json().get('data', [])
-        except Exception as error:
-            if retry < 3:
-                logger.warning(f"{self.session_name} | Can't getting tasks | Retry attempt: {retry}")
-                await asyncio.sleep(delay=randint(5, 10))
-                return await self.get_all_tasks(http_client, retry=retry + 1)
-
-            logger.error(f"{self.session_name} | Unknown error when getting tasks: {error}")
-            await asyncio.sleep(delay=3)
+    @with_retry('get_all_tasks', 'getting tasks')
+    async def get_all_tasks(self, http_client: HttpClient):
+        response = await http_client.get(f"{settings.API_BASE_URL}/quests/list")
+        response.raise_for_status()
+        return response.decode(quests_decoder).data or []
 
-    async def perform_web_task(self, http_client: cloudscraper.CloudScraper, tg_web_data: str, task_id: str):
+    async def perform_web_task(self, http_client: HttpClient, tg_web_data: str, task_id: str):
         try:
-            app_headers = http_client.headers
-            http_client.headers = web_headers.copy()
-            http_client.headers['Authorization'] = app_headers['Authorization']
-            response = http_client.post(f'https://api.paws.community/v1/quests/completed',
-                                        json={"questId": task_id}, timeout=60)
-            http_client.headers = app_headers
+            await self.quest_limiter.acquire()
+            response = await http_client.post(f'{settings.API_BASE_URL}/quests/completed',
+                                              json={"questId": task_id}, headers=self.web_headers, timeout=60)
             response.raise_for_status()
             response_json = response.json()
             return response_json.get('success', False) and response_json.get('data', False)
@@ -118,199 +177,106 @@ class Tapper:
             await asyncio.sleep(delay=3)
             return None
 
-    async def processing_tasks(self, http_client: cloudscraper.CloudScraper, tg_web_data: str):
+    async def process_quest(self, http_client: HttpClient, quest: Quest, progress: Progress,
+                            tg_web_data: str) -> QuestAction:
+        title = quest.title
+        result = True if (progress.current == progress.total and
+                          progress.status == "claimable") else None
+        if progress.current < progress.total or progress.status != "claimable":
+            action = await quest.handler(self, http_client, quest, progress, tg_web_data)
+            if action is not QuestAction.VERIFY:
+                return action
+
+            result = await self.verify_task(http_client, quest.id, None)
+
+        if result is not None:
+            if len(quest.rewards) == 0:
+                logger.success(f"{self.session_name} | Task <lc>{title}</lc> completed!")
+                return QuestAction.DONE
+            # the gap before the claim comes from the quest limiter inside claim_task_reward
+            is_claimed, amount = await self.claim_task_reward(http_client, quest.id)
+            if is_claimed:
+                rewards = quest.rewards[0]
+                amount = rewards['amount'] if amount is None else amount
+                logger.success(f"{self.session_name} | Task <lc>{title}</lc> completed! | "
+                               f"Reward: <e>+{amount}</e> PAWS")
+            else:
+                logger.info(f"{self.session_name} | "
+                            f"Rewards for task <lc>{title}</lc> not claimed")
+        else:
+            logger.info(f"{self.session_name} | Task <lc>{title}</lc> not completed")
+        return QuestAction.DONE
+
+    async def processing_tasks(self, http_client: HttpClient, tg_web_data: str):
+        semaphore = asyncio.Semaphore(settings.TASKS_CONCURRENCY)
+        stopped = asyncio.Event()
+
+        async def run_quest(quest: Quest, progress: Progress):
+            try:
+                if await self.process_quest(http_client, quest, progress, tg_web_data) is QuestAction.STOP:
+                    stopped.set()
+            except Exception as error:
+                logger.error(f"{self.session_name} | Unknown error when processing task <lc>{quest.title}</lc>: "
+                             f"{error}")
+            finally:
+                semaphore.release()
+
         try:
             tasks = await self.get_all_tasks(http_client)
             if tasks:
-                tasks = sorted(tasks, key=lambda t: t.get('sort', 999))
+                prune_quests(tasks)
+                tasks = sorted(tasks, key=lambda t: t.sort)
+                pending = []
                 for task in tasks:
-                    progress = task['progress']
-                    title = re.sub(r'<[^>]+>', '', task['title'])
-                    if not progress['claimed'] and task['code'] not in settings.DISABLED_TASKS and task[
-                        '_id'] != "679bc06e70efab8b96d0efdf":
-                        result = True if (progress['current'] == progress['total'] and
-                                          progress['status'] == "claimable") else None
-                        if progress['current'] < progress['total'] or progress['status'] != "claimable":
-                            is_partner = task.get('partner', False)
-                            if task['code'] == 'telegram':
-                                if task['flag'] == 0:
-                                    logger.info(f"{self.session_name} | Performing TG task <lc>{title}</lc>")
-                                else:
-                                    if task['type'] == 'partner-app' or not settings.JOIN_TG_CHANNELS:
-                                        continue
-
-                                    url = task['data']
-                                    logger.info(f"{self.session_name} | Performing TG subscription to <lc>{url}</lc>")
-                                    await self.tg_session.join_tg_channel(url)
-                            elif task['code'] == 'invite':
-                                counter = task['counter']
-                                referrals = await self.get_referrals(http_client)
-                                if counter > len(referrals):
-                                    continue
-                            elif (task['code'] in settings.SIMPLE_TASKS or is_partner) and task['flag'] == 0:
-                                logger.info(f"{self.session_name} | Performing <lc>{title}</lc> task")
-                            elif task['code'] == 'daily' or task['code'] == 'custom':
-                                end_time = task.get('availableUntil', 0)
-                                curr_time = time() * 1000
-                                if end_time < curr_time:
-                                    continue
-                                if task['_id'] != "678556b8ed515bd1fbea8147" or progress['status'] == 'waiting':
-                                    continue
-                                logger.info(f"{self.session_name} | Performing <lc>{title}</lc> task")
-                                result = await self.verify_task(http_client, task['_id'], None)
-                                if result:
-                                    logger.success(f"{self.session_name} | Task <lc>{title}</lc> completed "
-                                                   f"| Waiting to claim")
-                                continue
-                            elif task['code'] == 'wallet':
-                                if self.wallet is not None and len(self.wallet) > 0:
-                                    logger.info(
-                                        f"{self.session_name} | Performing wallet task: <lc>{title}</lc>")
-                                else:
-                                    continue
-
-                            elif task['code'] == 'custom1' and task['type'] == 'soll-wallet':
-                                end_time = task.get('availableUntil', 0)
-                                curr_time = time() * 1000
-                                if (self.solana_wallet is not None and len(self.solana_wallet) > 0
-                                        and end_time > curr_time):
-                                    logger.info(f"{self.session_name} | "
-                                                f"Performing Solana wallet task: <lc>{title}</lc>")
-                                else:
-                                    continue
-
-                            elif task['code'] == 'emojiName':
-                                logger.info(f"{self.session_name} | Performing <lc>{title}</lc> task")
-                                if '🐾' not in self.tg_session.name:
-                                    nickname = f'{self.tg_session.name}🐾'
-                                    await self.tg_session.change_tg_nickname(name=nickname)
-                                    continue
-                            elif task['code'] == 'touches':
-                                end_time = task.get('availableUntil', 0)
-                                curr_time = time() * 1000
-                                if end_time > curr_time:
-                                    logger.info(f"{self.session_name} | Performing <lc>{title}</lc> task")
-                                    additional_data = {
-                                        'timestamp': int(time() * 1000),
-                                        'x': round(random.uniform(150, 400), randint(9, 10)),
-                                        'y': round(random.uniform(300, 500), randint(9, 10))
-                                    }
-                                    result = await self.verify_task(http_client, task['_id'], additional_data)
-                                    if result is not None:
-                                        logger.success(f"{self.session_name} | Task <lc>{title}</lc> verified!")
-                                continue
-                            elif task['code'] == 'website-blank':
-                                if task['flag'] == 0 and task['_id'] in settings.WEB_TASKS:
-                                    end_time = task.get('availableUntil', 0)
-                                    curr_time = time() * 1000
-                                    if end_time < curr_time:
-                                        continue
-
-                                    logger.info(f"{self.session_name} | Performing <lc>{title}</lc> task")
-                                    result = await self.perform_web_task(http_client=http_client,
-                                                                         tg_web_data=tg_web_data,
-                                                                         task_id=task['_id'])
-                                    if result:
-                                        logger.success(f"{self.session_name} | Task <lc>{title}</lc> verified!")
-                                    break
-                                elif task['type'] == "walletConnect":
-                                    logger.info(f"{self.session_name} | Performing <lc>{title}</lc> task")
-                                    if self.ton_proof and self.sol_proof:
-                                        additional_data = {
-                                            'timestamp': int(time() * 1000),
-                                            'x': -1,
-                                            'y': -1
-                                        }
-                                        result = await self.verify_task(http_client, task['_id'], additional_data)
-                                        if result is not None:
-                                            logger.success(f"{self.session_name} | Task <lc>{title}</lc> completed!")
-                                    else:
-                                        logger.info(f"{self.session_name} | Can't complete <lc>{title}</lc> task "
-                                                    f"| Connected wallets: Ton - <e>{self.ton_proof}</e>, "
-                                                    f"Solana - <e>{self.sol_proof}</e>")
-                                    continue
-                                elif task['type'] == "pwa" and task['_id'] == "678a9cc119aff2d170842b10":
-                                    logger.info(f"{self.session_name} | Performing <lc>{title}</lc> custom task")
-                                    result = await self.perform_custom_task(http_client, task['_id'])
-                                    if result:
-                                        logger.success(f"{self.session_name} | Task <lc>{title}</lc> verified! "
-                                                       f"| Claim reward in next cycle")
-                                    continue
-                                else:
-                                    continue
-                            else:
-                                logger.info(
-                                    f"{self.session_name} | Unrecognized task: <lc>{title}</lc>")
-                                continue
-
-                            result = await self.verify_task(http_client, task['_id'], None)
-
-                        if result is not None:
-                            if len(task['rewards']) == 0:
-                                logger.success(f"{self.session_name} | Task <lc>{title}</lc> completed!")
-                                continue
-                            await asyncio.sleep(delay=randint(5, 10))
-                            is_claimed, amount = await self.claim_task_reward(http_client, task['_id'])
-                            if is_claimed:
-                                rewards = task['rewards'][0]
-                                amount = rewards['amount'] if amount is None else amount
-                                logger.success(f"{self.session_name} | Task <lc>{title}</lc> completed! | "
-                                               f"Reward: <e>+{amount}</e> PAWS")
-                            else:
-                                logger.info(f"{self.session_name} | "
-                                            f"Rewards for task <lc>{title}</lc> not claimed")
-                        else:
-                            logger.info(f"{self.session_name} | Task <lc>{title}</lc> not completed")
-
-                        await asyncio.sleep(delay=randint(5, 10))
+                    progress = task.progress
+                    quest = get_quest(task)
+                    if progress.claimed or quest.is_excluded:
+                        continue
+
+                    await semaphore.acquire()
+                    if stopped.is_set():
+                        semaphore.release()
+                        break
+                    pending.append(asyncio.create_task(run_quest(quest, progress)))
+
+                await asyncio.gather(*pending)
 
         except Exception as error:
             logger.error(f"{self.session_name} | Unknown error when processing tasks: {error}")
             await asyncio.sleep(delay=3)
 
-    async def verify_task(self, http_client: cloudscraper.CloudScraper, task_id: str,
-                          additional_data: dict[str, int] | None, retry=0):
-        try:
-            if additional_data is None:
-                add_data = {
-                    'timestamp': int(time() * 1000),
-                    'x': randint(150, 300),
-                    'y': randint(300, 450)
-                }
-            else:
-                add_data = additional_data
-            payload = {
-                'additionalData': add_data,
-                'questId': task_id
+    @with_retry('verify_task', 'verifying task')
+    async def verify_task(self, http_client: HttpClient, task_id: str,
+                          additional_data: dict[str, int] | None):
+        await self.quest_limiter.acquire()
+        if additional_data is None:
+            add_data = {
+                'timestamp': int(time() * 1000),
+                'x': randint(150, 300),
+                'y': randint(300, 450)
             }
-            response = http_client.post(f'https://api.paws.community/v1/quests/completed',
-                                        json=payload, timeout=60)
-            response.raise_for_status()
-            response_json = response.json()
-            status = response_json.get('success', False) and response_json.get('data', False)
-            return status
-
-        except Exception as e:
-            if retry < 3:
-                logger.warning(f"{self.session_name} | Can't verify task | Retry attempt: {retry}")
-                await asyncio.sleep(delay=randint(5, 10))
-                return await self.verify_task(http_client, task_id, additional_data, retry=retry + 1)
-
-            logger.error(f"{self.session_name} | Unknown error while verifying task <lc>{task_id}</lc> | Error: {e}")
-            await asyncio.sleep(delay=3)
-
-    async def perform_custom_task(self, http_client: cloudscraper.CloudScraper, task_id: str):
+        else:
+            add_data = additional_data
+        payload = {
+            'additionalData': add_data,
+            'questId': task_id
+        }
+        response = await http_client.post(f'{settings.API_BASE_URL}/quests/completed',
+                                          json=payload, timeout=60)
+        response.raise_for_status()
+        response_json = response.json()
+        status = response_json.get('success', False) and response_json.get('data', False)
+        return status
+
+    async def perform_custom_task(self, http_client: HttpClient, task_id: str):
         try:
+            await self.quest_limiter.acquire()
             payload = {
                 'code': "3CLJCb5uvE8n",
                 'questId': task_id
             }
-            app_headers = http_client.headers
-            http_client.headers = web_headers.copy()
-            http_client.headers['Authorization'] = app_headers['Authorization']
-            response = http_client.post(f'https://api.paws.community/v1/quests/custom',
-                                        json=payload, timeout=60)
-            http_client.headers = app_headers
+            response = await http_client.post(f'{settings.API_BASE_URL}/quests/custom',
+                                              json=payload, headers=self.web_headers, timeout=60)
             response.raise_for_status()
             response_json = response.json()
             status = response_json.get('success', False) and response_json['data'].get('completed', False)
@@ -321,8 +287,9 @@ class Tapper:
                          f"| Error: {e}")
             await asyncio.sleep(delay=3)
 
-    async def claim_task_reward(self, http_client: cloudscraper.CloudScraper, task_id: str):
+    async def claim_task_reward(self, http_client: HttpClient, task_id: str):
         try:
+            await self.quest_limiter.acquire()
             timestamp = int(time() * 1000)
             payload = {
                 'additionalData': {
@@ -333,8 +300,8 @@ class Tapper:
                 'questId': task_id
             }
             payload = {'questId': task_id} if task_id == "67926e87df75d42c3fff4ccc" else payload
-            response = http_client.post(f'https://api.paws.community/v1/quests/claim',
-                                        json=payload, timeout=60)
+            response = await http_client.post(f'{settings.API_BASE_URL}/quests/claim',
+                                              json=payload, timeout=60)
             response.raise_for_status()
             response_json = response.json()
             status = response_json.get('success', False) or response_json.get('completed', False)
@@ -350,10 +317,10 @@ class Tapper:
             await asyncio.sleep(delay=3)
             return None, None
 
-    async def get_referrals(self, http_client: cloudscraper.CloudScraper):
+    async def get_referrals(self, http_client: HttpClient):
         try:
-            response = http_client.get(f'https://api.paws.community/v1/referral/my?page=0&limit=10',
-                                       timeout=60)
+            response = await http_client.get(f'{settings.API_BASE_URL}/referral/my?page=0&limit=10',
+                                             timeout=60)
             response.raise_for_status()
             response_json = response.json()
             return response_json.get('data', [])
@@ -403,63 +370,41 @@ class Tapper:
                 elif wallet_type == 'Solana':
                     self.solana_wallet = None
 
-    async def get_user_info(self, http_client: cloudscraper.CloudScraper, retry=0):
-        try:
-            response = http_client.get('https://api.paws.community/v1/user')
-            response.raise_for_status()
-            response_json = response.json()
-            if response_json.get('success', False):
-                user_data = response_json.get('data')
-                return user_data
-            else:
-                raise Exception
+    def create_scraper(self) -> cloudscraper.CloudScraper:
+        # wallet managers still expect a synchronous cloudscraper session
+        scraper = cloudscraper.create_scraper()
+        if self.proxy:
+            proxies = {
+                'http': self.proxy,
+                'https': self.proxy,
+                'socks5': self.proxy
+            }
+            scraper.proxies.update(proxies)
 
-        except Exception as e:
-            if retry < 3:
-                logger.warning(f"{self.session_name} | Can't get user info | Retry attempt: {retry}")
-                await asyncio.sleep(delay=randint(5, 10))
-                return await self.get_user_info(http_client, retry=retry + 1)
+        scraper.headers.update(self.app_headers)
+        return scraper
 
-            logger.error(f"{self.session_name} | Unknown error while getting user info | Error: {e}")
-            await asyncio.sleep(delay=3)
+    @with_retry('get_user_info', 'getting user info')
+    async def get_user_info(self, http_client: HttpClient) -> UserInfo:
+        response = await http_client.get(f'{settings.API_BASE_URL}/user')
+        response.raise_for_status()
+        user_response = response.decode(user_decoder)
+        if user_response.success and user_response.data is not None:
+            return user_response.data
+        else:
+            raise ValueError(f"Unsuccessful response: {response.text}")
 
-    async def solve_captcha(self, http_client: cloudscraper.CloudScraper):
-        solver = Api_GXP()
-        solver.key = f"{settings.CAPTCHA_API_KEY}|SOFTID918432365"
-        for attempt in range(3):
-            await asyncio.sleep(delay=randint(5, 10))
-            logger.info(f"{self.session_name} | Attempt to solve CAPTCHA ({attempt + 1}/3)")
-            try:
-                balance = float(solver.get_balance())
-                if balance < 0.05:
-                    logger.warning(f"{self.session_name} | Not enough balance in 2Captcha service")
-                    return None
-                data = {
-                    "method": "userrecaptcha",
-                    "pageurl": "https://paws.community/app?tab=claim",
-                    "sitekey": "6Lda_s0qAAAAAItgCSBeQN_DVlM9YOk9MccqMG6_",
-                    "enterprise": "1",
-                    "action": "submit",
-                    "userAgent": http_client.headers['User-Agent'],
-                    "version": "v2"
-                }
-                result = solver.run(data)[:20]
-                if result and result != 'ERROR_CAPTCHA_UNSOLVABLE':
-                    logger.info(f"{self.session_name} | Successfully solved CAPTCHA")
-                    return result
-
-            except Exception as e:
-                logger.warning(f"{self.session_name} | Error while solving captcha {e}")
-                await asyncio.sleep(delay=3)
-                return None
-
-    async def pybass_activity_checker(self, http_client: cloudscraper.CloudScraper):
+    async def pybass_activity_checker(self, http_client: HttpClient):
         try:
-            result = await self.solve_captcha(http_client)
+            self.set_state('solving_captcha')
+            try:
+                result = await captcha_pool.acquire(self.session_name, user_agent=self.user_agent)
+            finally:
+                self.set_state('processing_tasks')
             if not result:
                 return False
             payload = {"recaptchaToken": result}
-            response = http_client.post(f"https://api.paws.community/v1/user/activity", json=payload)
+            response = await http_client.post(f"{settings.API_BASE_URL}/user/activity", json=payload)
             response.raise_for_status()
             response_json = response.json()
             return response_json.get('success') and response_json.get('data')
@@ -468,24 +413,19 @@ class Tapper:
             await asyncio.sleep(delay=3)
             return False
 
-    async def check_eligibility(self, http_client: cloudscraper.CloudScraper):
+    async def check_eligibility(self, http_client: HttpClient):
         try:
-            app_headers = http_client.headers
-            http_client.headers = web_headers.copy()
-            http_client.headers['Authorization'] = app_headers['Authorization']
-            response = http_client.get(f'https://api.paws.community/v1/eligibility')
-            http_client.headers = app_headers
+            response = await http_client.get(f'{settings.API_BASE_URL}/eligibility', headers=self.web_headers)
             response.raise_for_status()
-            response_json = response.json()
-            data = response_json.get('data')
+            data = response.decode(eligibility_decoder).data or []
             logger.info(f'{self.session_name} | Checking eligibility for airdrop..')
             activity_check = False
             for criteria in data:
-                criteria_name = criteria['criteriaName']
-                completed = criteria['meetsCriteria']
-                criteria_type = criteria['type']
-                req_value = criteria['requiredValue']
-                user_value = criteria['userValue']
+                criteria_name = criteria.criteria_name
+                completed = criteria.meets_criteria
+                criteria_type = criteria.type
+                req_value = criteria.required_value
+                user_value = criteria.user_value
                 value_info = ''
                 if not isinstance(req_value, bool) and not completed:
                     value_info = f'(<g>{user_value}/{req_value}</g>)'
@@ -496,148 +436,183 @@ class Tapper:
                 if criteria_name == 'activityCheck' and user_value:
                     activity_check = True
 
-            if settings.SOLVE_CAPTCHA and not activity_check:
+            self.activity_missing = not activity_check
+            if activity_check:
+                captcha_pool.discard(self.session_name)
+            elif settings.SOLVE_CAPTCHA:
                 result = await self.pybass_activity_checker(http_client)
                 if result:
+                    self.activity_missing = False
                     logger.info(f'{self.session_name} | Successfully passed activity checker!')
 
         except Exception as error:
+            captcha_pool.discard(self.session_name)
             logger.error(f"{self.session_name} | Unknown error when checking eligibility: {error}")
             await asyncio.sleep(delay=3)
             return None
 
-    async def run(self, user_agent: str, proxy: str | None) -> None:
-        access_token_created_time = 0
-        proxy_conn = ProxyConnector().from_url(proxy) if proxy else None
-        headers["User-Agent"] = user_agent
-        headers['Sec-Ch-Ua'] = get_sec_ch_ua(user_agent)
-
-        http_client = CloudflareScraper(headers=headers, connector=proxy_conn, trust_env=True,
-                                        auto_decompress=False)
-        scraper = cloudscraper.create_scraper()
-        if proxy:
-            proxies = {
-                'http': proxy,
-                'https': proxy,
-                'socks5': proxy
-            }
-            scraper.proxies.update(proxies)
-            await self.check_proxy(http_client=scraper, proxy=proxy)
-
-        token_live_time = randint(3500, 3600)
-        scraper.headers = http_client.headers.copy()
-        while True:
+    async def process_user(self, http_client: HttpClient, user_info: UserInfo, tg_web_data: str):
+        if settings.CHECK_ELIGIBILITY and settings.SOLVE_CAPTCHA and self.activity_missing:
+            # the last check missed the criterion, the captcha is solved while wallets and tasks are processed
+            captcha_pool.register(self.session_name, user_agent=self.user_agent)
+        self.paws_id = user_info.id
+        balance = user_info.game_data.balance
+        wallet = user_info.user_data.wallet
+        solana_wallet = user_info.user_data.solana_wallet
+        ton_web_wallet_proof = user_info.user_data.proof_ton_wallet
+        sol_web_wallet_proof = user_info.user_data.proof_solana_wallet
+        self.is_grinch = user_info.grinch_removed
+        self.wallet = wallet
+        self.solana_wallet = solana_wallet
+        is_wallet_connected = wallet is not None and len(wallet) > 0
+        is_solana_wallet_connected = solana_wallet is not None and len(solana_wallet) > 0
+        is_ton_wallet_verified = ton_web_wallet_proof is not None and len(ton_web_wallet_proof) > 0
+        is_sol_wallet_verified = sol_web_wallet_proof is not None and len(sol_web_wallet_proof) > 0
+        self.ton_proof = is_ton_wallet_verified
+        self.sol_proof = is_sol_wallet_verified
+        wallet_status = f"Ton Wallet (app): <y>{wallet}</y>" if is_wallet_connected \
+            else 'Ton wallet not connected in app'
+        wallet_status_web = f"Ton Wallet web proof: <y>{ton_web_wallet_proof}</y>" if is_ton_wallet_verified \
+            else 'Ton wallet not connected in web'
+        # solana_wallet_status = f"Solana wallet (app): <y>{solana_wallet}</y>" if is_solana_wallet_connected \
+        #    else 'Solana wallet not connected in app'
+        solana_wallet_status_web = f"Solana wallet web proof: <y>{sol_web_wallet_proof}</y>" \
+            if is_sol_wallet_verified else 'Solana wallet not connected in web'
+        logger.info(f"{self.session_name} | Balance: <e>{balance}</e> PAWS")
+        logger.info(f"{self.session_name} | {wallet_status}")
+        logger.info(f"{self.session_name} | {wallet_status_web}")
+        # logger.info(f"{self.session_name} | {solana_wallet_status}")
+        logger.info(f"{self.session_name} | {solana_wallet_status_web}")
+
+        # await self.check_wallet_status(scraper=scraper, wallet_type='Ton',
+        #                               is_connected=is_wallet_connected,
+        #                               need_to_connect=settings.CONNECT_TON_WALLET,
+        #                               need_to_disconnect=settings.DISCONNECT_TON_WALLET)
+        # await self.check_wallet_status(scraper=scraper, wallet_type='Solana',
+        #                               is_connected=is_solana_wallet_connected,
+        #                               need_to_connect=settings.CONNECT_SOLANA_WALLET,
+        #                               need_to_disconnect=settings.DISCONNECT_SOLANA_WALLET)
+
+        verify_ton = self.wallet and not is_ton_wallet_verified and settings.CONNECT_TON_WALLET
+        verify_solana = not is_sol_wallet_verified and settings.CONNECT_SOLANA_WALLET
+        if settings.VERIFY_WALLETS and (verify_ton or verify_solana):
+            # building a scraper blocks for tens of ms, so it's done off the loop and only when needed
+            scraper = await asyncio.to_thread(self.create_scraper)
             try:
-                sleep_time = randint(settings.SLEEP_TIME[0], settings.SLEEP_TIME[1])
-                if time() - access_token_created_time >= token_live_time:
-                    tg_web_data = await self.tg_session.get_tg_web_data()
+                if verify_ton:
+                    await asyncio.sleep(delay=randint(5, 10))
+                    await verify_ton_wallet(session_name=self.session_name, scraper=scraper, wallet=self.wallet)
+                if verify_solana:
+                    await asyncio.sleep(delay=randint(5, 10))
+                    await verify_solana_wallet(session_name=self.session_name,
+                                               scraper=scraper, wallet=self.solana_wallet)
+            finally:
+                scraper.close()
+
+        if settings.AUTO_TASK:
+            await self.quest_limiter.acquire()
+            await self.processing_tasks(http_client=http_client, tg_web_data=tg_web_data)
+            logger.info(f"{self.session_name} | All available tasks completed")
+
+        if settings.CHECK_ELIGIBILITY:
+            await self.quest_limiter.acquire()
+            await self.check_eligibility(http_client=http_client)
+
+        state_store.save(self.session_name, paws_id=self.paws_id, wallet=self.wallet,
+                         solana_wallet=self.solana_wallet, ton_proof=self.ton_proof, sol_proof=self.sol_proof,
+                         activity_missing=self.activity_missing)
+
+    async def run_cycle(self) -> int:
+        # clients only live for one pass, sleeping accounts hold no sockets
+        http_client = HttpClient(headers=self.app_headers, proxy_pool=self.proxy_pool)
+        self.set_state('processing_tasks')
+        self.circuit_wait = 0.0
+        try:
+            sleep_time = randint(settings.SLEEP_TIME[0], settings.SLEEP_TIME[1])
+            user_info = None
+            tg_web_data = self.tg_web_data if time() < self.tg_web_data_expires_at else ''
+            if time() - self.access_token_created_time >= self.token_live_time:
+                is_cached = bool(tg_web_data)
+                tg_web_data = await self.get_tg_web_data()
+                if tg_web_data is None:
+                    return self.get_failure_delay()
+
+                if not await is_valid_endpoints():
+                    logger.warning("Detected api change! Stopped the bot for safety | "
+                                   "Contact me for update: <lc>https://t.me/DesQwertys</lc>")
+                    sys.exit()
+                else:
+                    logger.info(f"{self.session_name} | Antidetect: endpoints successfully checked")
+
+                # if await self.send_plausible_event(http_client=http_client, web_data="https://app.paws.community/") is False:
+                #   await asyncio.sleep(randint(5, 10))
+                #   continue
+                self.set_state('logging_in')
+                # cached init data gets a single attempt, if it's rejected a new one is requested from Telegram
+                auth_data = await self.login(http_client=http_client, tg_web_data=tg_web_data,
+                                             max_retries=0 if is_cached else None)
+                if not auth_data and is_cached and not self.circuit_wait:
+                    logger.info(f"{self.session_name} | Cached web data rejected, requesting new one")
+                    tg_web_data = await self.get_tg_web_data(force=True)
                     if tg_web_data is None:
-                        continue
-
-                    if not is_valid_endpoints():
-                        logger.warning("Detected api change! Stopped the bot for safety | "
-                                       "Contact me for update: <lc>https://t.me/DesQwertys</lc>")
-                        sys.exit()
-                    else:
-                        logger.info(f"{self.session_name} | Antidetect: endpoints successfully checked")
-
-                    # if await self.send_plausible_event(http_client=scraper, web_data="https://app.paws.community/") is False:
-                    #   await asyncio.sleep(randint(5, 10))
-                    #   continue
-                    auth_data = await self.login(http_client=scraper, tg_web_data=tg_web_data)
-                    auth_token = auth_data[0]
-                    if auth_token is None:
-                        token_live_time = 0
-                        await asyncio.sleep(randint(100, 180))
-                        continue
-
-                    access_token_created_time = time()
-                    token_live_time = randint(3500, 3600)
-
-                    http_client.headers['Authorization'] = f'Bearer {auth_token}'
-                    scraper.headers = http_client.headers.copy()
-                    user_info = auth_data[1]
-                    self.paws_id = user_info['_id']
-                    balance = user_info['gameData']['balance']
-                    wallet = user_info['userData'].get('wallet', None)
-                    solana_wallet = user_info['userData'].get('solanaWallet', None)
-                    ton_web_wallet_proof = user_info['userData'].get('proofTonWallet', None)
-                    sol_web_wallet_proof = user_info['userData'].get('proofSolanaWallet', None)
-                    self.is_grinch = user_info.get('grinchRemoved', None)
-                    self.wallet = wallet
-                    self.solana_wallet = solana_wallet
-                    is_wallet_connected = wallet is not None and len(wallet) > 0
-                    is_solana_wallet_connected = solana_wallet is not None and len(solana_wallet) > 0
-                    is_ton_wallet_verified = ton_web_wallet_proof is not None and len(ton_web_wallet_proof) > 0
-                    is_sol_wallet_verified = sol_web_wallet_proof is not None and len(sol_web_wallet_proof) > 0
-                    self.ton_proof = is_ton_wallet_verified
-                    self.sol_proof = is_sol_wallet_verified
-                    wallet_status = f"Ton Wallet (app): <y>{wallet}</y>" if is_wallet_connected \
-                        else 'Ton wallet not connected in app'
-                    wallet_status_web = f"Ton Wallet web proof: <y>{ton_web_wallet_proof}</y>" if is_ton_wallet_verified \
-                        else 'Ton wallet not connected in web'
-                    # solana_wallet_status = f"Solana wallet (app): <y>{solana_wallet}</y>" if is_solana_wallet_connected \
-                    #    else 'Solana wallet not connected in app'
-                    solana_wallet_status_web = f"Solana wallet web proof: <y>{sol_web_wallet_proof}</y>" \
-                        if is_sol_wallet_verified else 'Solana wallet not connected in web'
-                    logger.info(f"{self.session_name} | Balance: <e>{balance}</e> PAWS")
-                    logger.info(f"{self.session_name} | {wallet_status}")
-                    logger.info(f"{self.session_name} | {wallet_status_web}")
-                    # logger.info(f"{self.session_name} | {solana_wallet_status}")
-                    logger.info(f"{self.session_name} | {solana_wallet_status_web}")
-
-                    # await self.check_wallet_status(scraper=scraper, wallet_type='Ton',
-                    #                               is_connected=is_wallet_connected,
-                    #                               need_to_connect=settings.CONNECT_TON_WALLET,
-                    #                               need_to_disconnect=settings.DISCONNECT_TON_WALLET)
-                    # await self.check_wallet_status(scraper=scraper, wallet_type='Solana',
-                    #                               is_connected=is_solana_wallet_connected,
-                    #                               need_to_connect=settings.CONNECT_SOLANA_WALLET,
-                    #                               need_to_disconnect=settings.DISCONNECT_SOLANA_WALLET)
-
-                    if settings.VERIFY_WALLETS:
-                        if self.wallet and not is_ton_wallet_verified and settings.CONNECT_TON_WALLET:
-                            await asyncio.sleep(delay=randint(5, 10))
-                            await verify_ton_wallet(session_name=self.session_name, scraper=scraper, wallet=self.wallet)
-                        if not is_sol_wallet_verified and settings.CONNECT_SOLANA_WALLET:
-                            await asyncio.sleep(delay=randint(5, 10))
-                            await verify_solana_wallet(session_name=self.session_name,
-                                                       scraper=scraper, wallet=self.solana_wallet)
-
-                    if settings.AUTO_TASK:
-                        await asyncio.sleep(delay=randint(5, 10))
-                        await self.processing_tasks(http_client=scraper, tg_web_data=tg_web_data)
-                        logger.info(f"{self.session_name} | All available tasks completed")
-
-                    if settings.CHECK_ELIGIBILITY:
-                        await asyncio.sleep(delay=randint(5, 10))
-                        await self.check_eligibility(http_client=scraper)
-
-                if settings.CLEAR_TG_NAME and '🐾' in self.tg_session.name:
-                    logger.info(f"{self.session_name} | Removing 🐾 from name..")
-                    nickname = self.tg_session.name.replace('🐾', '')
-                    await self.tg_session.change_tg_nickname(name=nickname)
-
-                logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
-                await asyncio.sleep(delay=sleep_time)
-
-            except InvalidSession as error:
-                raise error
+                        return self.get_failure_delay()
+                    auth_data = await self.login(http_client=http_client, tg_web_data=tg_web_data)
+
+                auth_token = auth_data[0] if auth_data else None
+                self.set_state('processing_tasks')
+                if auth_token is None:
+                    self.token_live_time = 0
+                    return self.get_failure_delay()
+
+                self.set_access_token(auth_token)
+                self.access_token_created_time = time()
+                self.token_live_time = randint(3500, 3600)
+
+                http_client.headers = self.app_headers
+                user_info = auth_data[1]
+                state_store.save(self.session_name, access_token=auth_token,
+                                 created_at=self.access_token_created_time,
+                                 expires_at=get_token_expiry(auth_token,
+                                                             default=self.access_token_created_time + 3600))
+            elif self.token_restored:
+                logger.info(f"{self.session_name} | Reusing saved auth token")
+                user_info = await self.get_user_info(http_client)
+                self.token_restored = False
+                if user_info is None:
+                    self.token_live_time = 0
+                    return self.get_failure_delay()
+            self.token_restored = False
+
+            if user_info is not None:
+                await self.process_user(http_client=http_client, user_info=user_info, tg_web_data=tg_web_data)
+
+            if settings.CLEAR_TG_NAME and '🐾' in self.tg_session.name:
+                logger.info(f"{self.session_name} | Removing 🐾 from name..")
+                nickname = self.tg_session.name.replace('🐾', '')
+                await self.tg_session.change_tg_nickname(name=nickname)
+
+            if self.circuit_wait:
+                # part of the pass hit an open circuit, come back once the endpoint is probed again
+                sleep_time = self.get_failure_delay()
+            else:
+                self.failed_cycles = 0
+            self.schedule_tg_web_data_refresh(sleep_time)
+            logger.info(f"{self.session_name} | Sleep <y>{round(sleep_time / 60, 1)}</y> min")
+            state_store.save(self.session_name, next_cycle_at=time() + sleep_time)
+            return sleep_time
 
-            except Exception as error:
-                logger.error(f"{self.session_name} | Unknown error: {error}")
-                await asyncio.sleep(delay=randint(60, 120))
+        except InvalidSession as error:
+            raise error
 
-            except KeyboardInterrupt:
-                logger.warning("<r>Bot stopped by user...</r>")
-            finally:
-                if scraper is not None:
-                    await http_client.close()
-                    scraper.close()
+        except CircuitOpen as error:
+            logger.warning(f"{self.session_name} | {error}")
+            self.circuit_wait = max(self.circuit_wait, error.retry_after)
+            return self.get_failure_delay()
 
+        except Exception as error:
+            logger.error(f"{self.session_name} | Unknown error: {error}")
+            return self.get_failure_delay()
 
-async def run_tapper(tg_session: TGSession, user_agent: str, proxy: str | None):
-    try:
-        await Tapper(tg_session=tg_session).run(user_agent=user_agent, proxy=proxy)
-    except InvalidSession:
-        logger.error(f"{tg_session.session_name} | Invalid Session")
+        finally:
+            self.set_state('sleeping')
+            await http_client.close()
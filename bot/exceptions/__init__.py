@@ -1,2 +1,22 @@
 class InvalidSession(BaseException):
     ...
+
+
+class HttpError(Exception):
+    def __init__(self, status_code: int, url: str):
+        super().__init__(f"{status_code} Error for url: {url}")
+        self.status_code = status_code
+        self.url = url
+
+
+class CircuitOpen(Exception):
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(f"Circuit open for {endpoint}, retry in {retry_after:.0f} sec")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class SchemaError(Exception):
+    def __init__(self, url: str, message: str):
+        super().__init__(f"Unexpected response schema for url: {url} | {message}")
+        self.url = url
@@ -0,0 +1,56 @@
+import json
+import os
+from contextlib import contextmanager
+
+from bot.utils.file_manager import load_from_json
+
+
+class AccountStore:
+    def __init__(self, path: str = 'sessions/accounts.json'):
+        self.path = path
+        self._accounts: dict[str, dict] | None = None
+        self.dirty = False
+
+    @property
+    def accounts(self) -> dict[str, dict]:
+        if self._accounts is None:
+            self._accounts = {account['session_name']: account for account in load_from_json(self.path)}
+        return self._accounts
+
+    def __contains__(self, session_name: str) -> bool:
+        return session_name in self.accounts
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    def get(self, session_name: str) -> dict | None:
+        return self.accounts.get(session_name)
+
+    def add(self, account: dict) -> None:
+        self.accounts[account['session_name']] = account
+        self.dirty = True
+
+    def update(self, session_name: str, **fields) -> None:
+        self.accounts[session_name].update(fields)
+        self.dirty = True
+
+    def flush(self) -> None:
+        if not self.dirty:
+            return
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(list(self.accounts.values()), file, ensure_ascii=False, indent=2)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    @contextmanager
+    def batch(self):
+        try:
+            yield self
+        finally:
+            self.flush()
+
+
+account_store = AccountStore()
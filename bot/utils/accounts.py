@@ -1,9 +1,10 @@
 import os
+import sys
 
 from bot.core.agents import generate_random_user_agent, is_user_agent_valid, get_telegram_custom_params
 from bot.utils import logger
 from bot.config import settings
-from bot.utils.file_manager import load_from_json, save_to_json, update_ua_json_data
+from bot.utils.account_store import account_store
 
 
 class Accounts:
@@ -14,28 +15,27 @@ class Accounts:
 
     @staticmethod
     def get_available_accounts(sessions: list):
-
-        accounts_from_json = load_from_json('sessions/accounts.json')
-
-        if not accounts_from_json:
+        if not account_store:
             raise ValueError("Can't run script | Please, add account/s in sessions/accounts.json")
 
         available_accounts = []
-        for session in sessions:
-            is_session_added = False
-            for saved_account in accounts_from_json:
-                if saved_account['session_name'] == session:
+        with account_store.batch():
+            for session in sessions:
+                saved_account = account_store.get(session)
+                if saved_account is not None:
                     if not is_user_agent_valid(saved_account['user_agent']):
                         tg_params = get_telegram_custom_params(saved_account['user_agent'])
-                        saved_account['user_agent'] = saved_account['user_agent'] + tg_params if tg_params else (
+                        user_agent = saved_account['user_agent'] + tg_params if tg_params else (
                             generate_random_user_agent(device_type='android', browser_type='chrome'))
-                        update_ua_json_data(f'sessions/accounts.json', dict_=saved_account)
-                        logger.success(f'{saved_account["session_name"]} | Successfully updated User-Agent data')
+                        account_store.update(session, user_agent=user_agent)
+                        logger.success(f'{session} | Successfully updated User-Agent data')
                     available_accounts.append(saved_account)
-                    is_session_added = True
-                    break
-            if not is_session_added:
+                    continue
+
                 logger.warning(f'{session}.session does not exist in sessions/accounts.json')
+                if not sys.stdin.isatty():
+                    logger.warning(f'{session} | Skipped, use "-a 5 --import file.csv" to add sessions without a TTY')
+                    continue
                 ans = input(f"Add {session} to accounts.json? (y/N): ")
                 if 'y' in ans.lower():
                     raw_proxy = input("Input the proxy in the format type://user:pass:ip:port (press Enter to use without proxy): ")
@@ -45,7 +45,7 @@ class Accounts:
                          "user_agent": user_agent,
                          "proxy": raw_proxy
                     }
-                    save_to_json(f'sessions/accounts.json', dict_=new_account)
+                    account_store.add(new_account)
                     available_accounts.append(new_account)
                     logger.success(f'Account {session} added successfully')
 
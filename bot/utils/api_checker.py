@@ -1,8 +1,11 @@
-import requests
+import asyncio
 import re
+from time import time
 
+import aiohttp
 from bs4 import BeautifulSoup
 
+from bot.config import settings
 from bot.core.headers import headers
 from bot.utils import logger
 
@@ -13,75 +16,104 @@ endpoints = ['quests/completed', 'quests/claim',
              'referral/my?page', 'user',
              'quests/list', 'user/leaderboard?page=0&limit=100']
 
+url_pattern = re.compile(r'"(https?://[^"]+)"')
 
-def find_js_files(base_url):
-    try:
-        response = requests.get(base_url)
-        response.raise_for_status()
-        content = response.text
-        soup = BeautifulSoup(content, 'html.parser')
-        scripts = soup.find_all('script', src=True)
-        app_js_file = None
-        index_js_file = None
-
-        for script in scripts:
-            if '/pages/_app' in script.attrs.get('src'):
-                app_js_file = script['src']
-            if 'pages/index' in script.attrs.get('src'):
-                index_js_file = script['src']
-        return app_js_file, index_js_file
-    except requests.RequestException as e:
-        logger.warning(f"Error fetching the base URL: {e}")
-        return None, None
-
-
-def get_js_content(js_url):
+# result of the last successful check, shared by every account in the process
+checked_bundles: tuple[str, str] | None = None
+checked_time = 0.0
+check_task: asyncio.Task | None = None
+
+
+def find_js_files(content: str):
+    soup = BeautifulSoup(content, 'html.parser')
+    scripts = soup.find_all('script', src=True)
+    app_js_file = None
+    index_js_file = None
+
+    for script in scripts:
+        if '/pages/_app' in script.attrs.get('src'):
+            app_js_file = script['src']
+        if 'pages/index' in script.attrs.get('src'):
+            index_js_file = script['src']
+    return app_js_file, index_js_file
+
+
+def is_valid_app_js(content: str, full_url: str) -> bool:
+    result = url_pattern.findall(content)
+    if not result:
+        logger.warning(f"Js code has changed! {full_url}")
+        return False
+    if base_api_url not in result:
+        logger.warning(f"Base URL <lc>{base_api_url}</lc> not found.")
+        return False
+
+    for endpoint in auth_endpoints:
+        if endpoint not in content:
+            logger.warning(f"Auth endpoint <lc>{endpoint}</lc> not found.")
+            return False
+    return True
+
+
+def is_valid_index_js(content: str) -> bool:
+    for endpoint in endpoints:
+        if endpoint not in content:
+            logger.warning(f"Endpoint <lc>{endpoint}</lc> not found.")
+            return False
+    return True
+
+
+async def get_content(session: aiohttp.ClientSession, url: str) -> str | None:
     try:
-        response = requests.get(js_url)
-        response.raise_for_status()
-        content = response.text
-        match = re.findall(r'"(https?://[^"]+)"', content)
-        if match:
-            return match, content
-        else:
-            logger.info("Could not find 'api' in the content.")
-            return None
-    except requests.RequestException as e:
-        logger.warning(f"Error fetching the JS file: {e}")
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=60)) as response:
+            response.raise_for_status()
+            return await response.text()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.warning(f"Error fetching <lc>{url}</lc>: {e}")
         return None
 
 
-def is_valid_endpoints():
+async def check_endpoints() -> bool:
+    global checked_bundles, checked_time
+
     base_url = headers['Origin']
-    app_js_file, index_js_file = find_js_files(base_url)
-    if app_js_file and index_js_file:
-        full_url = f"{base_url}{app_js_file}"
-        result, content = get_js_content(full_url)
-        if not result:
-            logger.warning(f"Js code has changed! {full_url}")
+    async with aiohttp.ClientSession() as session:
+        page = await get_content(session, base_url)
+        if page is None:
             return False
-        if base_api_url not in result:
-            logger.warning(f"Base URL <lc>{base_api_url}</lc> not found.")
+
+        app_js_file, index_js_file = await asyncio.to_thread(find_js_files, page)
+        if not app_js_file or not index_js_file:
+            logger.warning("Could not find any main.js format. Dumping page content for inspection:")
+            print(page[:1000])
             return False
 
-        for endpoint in auth_endpoints:
-            if endpoint not in content:
-                logger.warning(f"Auth endpoint <lc>{endpoint}</lc> not found.")
-                return None
-
-        full_url = f"{base_url}{index_js_file}"
-        result, content = get_js_content(full_url)
-        for endpoint in endpoints:
-            if endpoint not in content:
-                logger.warning(f"Endpoint <lc>{endpoint}</lc> not found.")
-                return False
-        return True
-    else:
-        logger.warning("Could not find any main.js format. Dumping page content for inspection:")
-        try:
-            response = requests.get(base_url)
-            print(response.text[:1000])
+        # bundle names carry a content hash, so the same names mean the same code
+        bundles = (app_js_file, index_js_file)
+        if bundles == checked_bundles:
+            checked_time = time()
+            return True
+
+        full_url = f"{base_url}{app_js_file}"
+        content = await get_content(session, full_url)
+        if content is None or not await asyncio.to_thread(is_valid_app_js, content, full_url):
             return False
-        except requests.RequestException as e:
-            logger.warning(f"Error fetching the base URL for content dump: {e}")
+
+        content = await get_content(session, f"{base_url}{index_js_file}")
+        if content is None or not await asyncio.to_thread(is_valid_index_js, content):
             return False
+
+    checked_bundles = bundles
+    checked_time = time()
+    return True
+
+
+async def is_valid_endpoints() -> bool:
+    # concurrent callers wait for the same in-flight check
+    global check_task
+
+    if checked_bundles is not None and time() - checked_time < settings.ENDPOINTS_CHECK_TTL:
+        return True
+
+    if check_task is None or check_task.done():
+        check_task = asyncio.create_task(check_endpoints())
+    return await asyncio.shield(check_task)
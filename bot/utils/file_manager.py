@@ -29,18 +29,3 @@ def save_to_json(path: str, dict_):
         with open(path, 'x', encoding='utf-8') as file:
             json.dump([dict_], file, ensure_ascii=False, indent=2)
 
-
-def update_ua_json_data(path: str, dict_):
-    if os.path.isfile(path):
-        with open(path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-
-        for session in data:
-            if session["session_name"] == dict_["session_name"]:
-                session["user_agent"] = dict_["user_agent"]
-
-        with open(path, 'w', encoding='utf-8') as file:
-            json.dump(data, file, ensure_ascii=False, indent=2)
-    else:
-        with open(path, 'x', encoding='utf-8') as file:
-            json.dump([dict_], file, ensure_ascii=False, indent=2)
@@ -1,17 +1,12 @@
-import asyncio
 import argparse
-from random import randint
+import asyncio
+import sys
+from random import randint, uniform
+from time import time
 from typing import Any
-from better_proxy import Proxy
 
 from bot.config import settings
 from bot.utils import logger
-from bot.core.tapper import run_tapper
-from bot.core.registrator import register_sessions
-from bot.utils.accounts import Accounts
-from bot.core.TgManager.tg_manager import SessionManager
-from bot.core.WalletManager.WalletManager import generate_wallets, get_not_connected_wallets
-from bot.core.WalletManager.SolanaManager import get_solana_not_connected_wallets, generate_solana_wallets
 
 
 start_text = """
@@ -29,17 +24,34 @@ Select an action:
     2. Create session (Pyrogram)
     3. Generate TON wallets
     4. Generate Solana wallets
+    5. Import sessions from CSV/JSONL file
+    6. Run load test against local mock API
 """
 
 
-def get_proxy(raw_proxy: str) -> Proxy:
+def get_proxy(raw_proxy: str) -> str | None:
+    from better_proxy import Proxy
     return Proxy.from_str(proxy=raw_proxy).as_url if raw_proxy else None
 
 
+def get_fallback_proxies(account: dict) -> list[str]:
+    fallback_proxies = account.get('fallback_proxies') or []
+    if isinstance(fallback_proxies, str):
+        fallback_proxies = settings.PROXY_POOLS.get(fallback_proxies, [])
+    return [get_proxy(raw_proxy=raw_proxy) for raw_proxy in fallback_proxies if raw_proxy]
+
+
 async def process() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("-a", "--action", type=int, help="Action to perform")
-    action = parser.parse_args().action
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Number of worker processes for action 1")
+    parser.add_argument("-i", "--import", dest="import_file", help="CSV/JSONL file with sessions for action 5")
+    parser.add_argument("--accounts", type=int, default=1000, help="Number of simulated accounts for action 6")
+    parser.add_argument("--duration", type=int, default=300, help="Load test duration in seconds for action 6")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock API latency in seconds for action 6")
+    parser.add_argument("--error-rate", type=float, default=0.01, help="Share of failed mock API requests for action 6")
+    args = parser.parse_args()
+    action = args.action
 
     if not action:
         print(start_text)
@@ -49,13 +61,26 @@ async def process() -> None:
 
             if not action.isdigit():
                 logger.warning("Action must be number")
-            elif action not in ["1", "2", "3", "4"]:
-                logger.warning("Action must be 1, 2, 3 or 4")
+            elif action not in ["1", "2", "3", "4", "5", "6"]:
+                logger.warning("Action must be 1, 2, 3, 4, 5 or 6")
             else:
                 action = int(action)
                 break
 
-    if action == 4:
+    # heavy dependencies (HTTP stack, TG and wallet managers) are imported only by the action that needs them
+    if action == 6:
+        from bot.utils.load_test import run_load_test
+        await run_load_test(accounts=args.accounts, duration=args.duration,
+                            latency=args.latency, error_rate=args.error_rate)
+    elif action == 5:
+        from bot.core.importer import import_sessions
+        if not args.import_file and not sys.stdin.isatty():
+            logger.warning('No file to import, use "-a 5 --import file.csv" without a TTY')
+            return
+        path = args.import_file or input("Enter the path to CSV/JSONL file with sessions: ")
+        await import_sessions(path=path.strip())
+    elif action == 4:
+        from bot.core.WalletManager.SolanaManager import generate_solana_wallets
         count = input("Enter the number of wallets (Solana) to generate: ")
         try:
             count = int(count)
@@ -65,6 +90,7 @@ async def process() -> None:
             logger.warning("Please enter a valid number.")
             return
     elif action == 3:
+        from bot.core.WalletManager.WalletManager import generate_wallets
         count = input("Enter the number of wallets (Ton) to generate: ")
         try:
             count = int(count)
@@ -74,14 +100,31 @@ async def process() -> None:
             logger.warning("Please enter a valid number.")
             return
     elif action == 2:
+        from bot.core.registrator import register_sessions
         await register_sessions()
     elif action == 1:
+        from bot.utils.accounts import Accounts
         accounts = await Accounts().get_accounts()
-        await run_tasks(accounts=accounts)
+        if args.workers > 1:
+            from bot.utils.supervisor import run_workers
+            await run_workers(accounts=accounts, workers=args.workers)
+        else:
+            await run_tasks(accounts=accounts)
 
 
 async def run_tasks(accounts: [Any, Any, list]):
-    tasks = []
+    from bot.core.http_client import close_http2_clients
+    from bot.core.proxy_prober import proxy_prober
+    from bot.core.rate_limiter import rate_limiter
+    from bot.core.scheduler import Scheduler
+    from bot.core.tapper import Tapper
+    from bot.core.TgManager.tg_manager import SessionManager
+    from bot.core.WalletManager.WalletManager import get_not_connected_wallets
+    from bot.core.WalletManager.SolanaManager import get_solana_not_connected_wallets
+    from bot.exceptions import InvalidSession
+    from bot.utils.state_store import state_store
+
+    scheduler = Scheduler(workers=settings.SCHEDULER_WORKERS)
     manager = SessionManager(api_id=settings.API_ID,
                              api_hash=settings.API_HASH,
                              peer='PAWSOG_bot',
@@ -95,11 +138,44 @@ async def run_tasks(accounts: [Any, Any, list]):
     if settings.CONNECT_SOLANA_WALLET:
         valid_solana_wallets = get_solana_not_connected_wallets()
         logger.info(f'Found <e>{len(valid_solana_wallets)}</e> not connected wallet/s (Solana)')
-    for account in accounts:
-        session_name, user_agent, raw_proxy = account.values()
-        tg_session = await manager.get_tg_session(session_name=session_name, proxy=raw_proxy)
-        proxy = get_proxy(raw_proxy=raw_proxy)
-        tasks.append(asyncio.create_task(run_tapper(tg_session=tg_session, user_agent=user_agent, proxy=proxy)))
-        await asyncio.sleep(delay=randint(settings.START_DELAY[0], settings.START_DELAY[1]))
-
-    await asyncio.gather(*tasks)
+    saved_states = state_store.load_all()
+    semaphore = asyncio.Semaphore(settings.WARMUP_CONCURRENCY)
+
+    async def warm_up(account: dict) -> bool:
+        session_name, user_agent, raw_proxy = account['session_name'], account['user_agent'], account['proxy']
+        async with semaphore:
+            try:
+                tg_session = await manager.get_tg_session(session_name=session_name, proxy=raw_proxy)
+            except (Exception, InvalidSession) as error:
+                logger.error(f"{session_name} | Failed to load session: {error}")
+                return False
+        tapper = Tapper(tg_session=tg_session, user_agent=user_agent, proxy=get_proxy(raw_proxy=raw_proxy),
+                        fallback_proxies=get_fallback_proxies(account))
+        if session_name in saved_states:
+            tapper.restore_state(saved_states[session_name])
+        # starts are spread over START_WINDOW instead of being chained one after another
+        start_delay = uniform(0, settings.START_WINDOW) + randint(settings.START_DELAY[0], settings.START_DELAY[1])
+        scheduler.schedule(tapper, delay=max(start_delay, tapper.next_cycle_at - time()))
+        return tapper.token_restored
+
+    results = await asyncio.gather(*(warm_up(account) for account in accounts))
+    restored = sum(results)
+
+    await proxy_prober.probe_all(proxy for account in accounts
+                                 for proxy in [get_proxy(raw_proxy=account['proxy']), *get_fallback_proxies(account)])
+    proxy_prober.log_scores()
+    if settings.PROXY_CHECK_INTERVAL:
+        asyncio.create_task(proxy_prober.run(interval=settings.PROXY_CHECK_INTERVAL))
+
+    logger.info(f"Restored saved auth tokens for <e>{restored}</e> account/s")
+    if settings.METRICS_PORT:
+        from bot.utils.metrics import start_metrics_server
+        await start_metrics_server(port=settings.METRICS_PORT)
+        logger.info(f"Metrics are available at <lc>http://127.0.0.1:{settings.METRICS_PORT}/metrics</lc>")
+    if settings.RATE_LIMIT_REPORT_INTERVAL:
+        asyncio.create_task(rate_limiter.report(interval=settings.RATE_LIMIT_REPORT_INTERVAL))
+
+    try:
+        await scheduler.run()
+    finally:
+        await close_http2_clients()
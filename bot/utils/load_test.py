@@ -0,0 +1,106 @@
+import asyncio
+import sys
+import tempfile
+from random import uniform
+from time import monotonic, process_time
+
+from bot.config import settings
+from bot.utils import logger
+from bot.utils.logger import add_sink
+
+
+def get_peak_memory() -> str:
+    try:
+        import resource
+    except ImportError:
+        return 'n/a'
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    return f'{peak / (1024 * 1024 if sys.platform == "darwin" else 1024):.0f} MB'
+
+
+def get_quantile(histogram, quantile: float) -> float | None:
+    buckets = [0] * (len(histogram.buckets) + 1)
+    for counts, _ in histogram.series.values():
+        buckets = [total + count for total, count in zip(buckets, counts)]
+    target = quantile * sum(buckets)
+    cumulative = 0
+    for bound, count in zip((*histogram.buckets, float('inf')), buckets):
+        cumulative += count
+        if cumulative >= target and cumulative:
+            return bound
+    return None
+
+
+async def run_load_test(accounts: int, duration: int, latency: float, error_rate: float) -> None:
+    import bot.core.tapper as tapper_module
+    from bot.core.agents import generate_random_user_agent
+    from bot.core.http_client import close_http2_clients
+    from bot.core.mock_server import FakeTGSession, MockPawsServer
+    from bot.core.scheduler import Scheduler
+    from bot.core.solver_tg import async_solvers
+    from bot.core.tapper import Tapper
+    from bot.utils.metrics import (accounts as account_states, http_connections, http_handshake, http_latency,
+                                   http_requests, retries)
+    from bot.utils.state_store import state_store
+
+    server = MockPawsServer(latency=latency, error_rate=error_rate)
+    url = await server.start()
+
+    async def endpoints_unchanged() -> bool:
+        return True
+
+    # the stand-in has no web app bundles to compare with
+    tapper_module.is_valid_endpoints = endpoints_unchanged
+    settings.API_BASE_URL = f'{url}/v1'
+    settings.CAPTCHA_API_URL = url
+    settings.CAPTCHA_API_KEY = 'load-test'
+    settings.SOLVE_CAPTCHA = True
+    settings.CHECK_ELIGIBILITY = True
+    settings.AUTO_TASK = True
+    settings.VERIFY_WALLETS = False
+    settings.CLEAR_TG_NAME = False
+    settings.RATE_LIMIT_DEFAULT = 0
+    settings.RATE_LIMITS = {}
+    state_store.path = f'{tempfile.mkdtemp()}/state.db'
+
+    logger.remove()
+    add_sink(sys.stdout, level='WARNING')
+
+    scheduler = Scheduler(workers=settings.SCHEDULER_WORKERS)
+    for index in range(accounts):
+        tapper = Tapper(tg_session=FakeTGSession(session_name=f'load_{index}'),
+                        user_agent=generate_random_user_agent(device_type='android', browser_type='chrome'),
+                        proxy=None)
+        scheduler.schedule(tapper, delay=uniform(0, settings.START_WINDOW))
+
+    print(f'Load test | Accounts: {accounts}, Duration: {duration} sec, Start window: {settings.START_WINDOW} sec, '
+          f'Latency: {latency} sec, Error rate: {error_rate}, HTTP/2: {settings.HTTP2}, Mock API: {url}')
+    started, cpu_started = monotonic(), process_time()
+    task = asyncio.create_task(scheduler.run())
+    await asyncio.sleep(duration)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    elapsed, cpu_time = monotonic() - started, process_time() - cpu_started
+
+    requests = sum(http_requests.values.values())
+    failed = sum(value for key, value in http_requests.values.items() if key[3] == 'error' or int(key[3]) >= 400)
+    latency_sum = sum(total for _, total in http_latency.series.values())
+    cycles = sum(1 for state in state_store.load_all().values() if state['next_cycle_at'])
+    for solver in async_solvers.values():
+        await solver.close()
+    await close_http2_clients()
+    await server.stop()
+    state_store.close()
+
+    print(f'Completed cycles:   {cycles}/{accounts}')
+    print(f'Requests:           {requests} ({requests / elapsed:.1f} req/s), failed: {failed}, '
+          f'injected errors: {sum(server.errors.values())}')
+    print(f'Latency:            avg {latency_sum / requests if requests else 0:.3f} sec, '
+          f'p50 <= {get_quantile(http_latency, 0.5)} sec, p99 <= {get_quantile(http_latency, 0.99)} sec')
+    print(f'Connections:        {dict((key[0], int(value)) for key, value in http_connections.values.items())}, '
+          f'handshake p50 <= {get_quantile(http_handshake, 0.5)} sec, p99 <= {get_quantile(http_handshake, 0.99)} sec')
+    print(f'Retries:            {dict((key[0], int(value)) for key, value in retries.values.items())}')
+    print(f'Account states:     {dict((key[0], int(value)) for key, value in account_states.values.items() if value)}')
+    print(f'CPU:                {cpu_time:.1f} sec ({cpu_time / elapsed * 100:.0f}% of one core)')
+    print(f'Peak memory:        {get_peak_memory()}')
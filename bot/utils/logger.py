@@ -1,10 +1,55 @@
+import atexit
+import json
 import sys
+from random import random
+
 from loguru import logger
 
+from bot.config import settings
+
+
+log_format = ("<white>{time:YYYY-MM-DD HH:mm:ss}</white>"
+              " | <level>{level: <8}</level>"
+              " | <cyan><b>{line}</b></cyan>"
+              " - <white><b>{message}</b></white>")
+
+account_levels = {session_name: logger.level(level.upper()).no
+                  for session_name, level in settings.LOG_ACCOUNT_LEVELS.items()}
+sampling = {level.upper(): rate for level, rate in settings.LOG_SAMPLING.items()}
+
+
+def log_filter(record) -> bool:
+    # per-account levels go first, records of other accounts are sampled by level
+    if account_levels:
+        level = account_levels.get(record['message'].partition(' | ')[0])
+        if level is not None:
+            return record['level'].no >= level
+    rate = sampling.get(record['level'].name)
+    return rate is None or random() < rate
+
+
+def json_format(record) -> str:
+    session_name, separator, message = record['message'].partition(' | ')
+    record['extra']['json'] = json.dumps({
+        'time': record['time'].isoformat(),
+        'level': record['level'].name,
+        'module': record['name'],
+        'line': record['line'],
+        'session': session_name if separator else None,
+        'message': message if separator else session_name,
+        **{key: value for key, value in record['extra'].items() if key != 'json'}
+    }, ensure_ascii=False, default=str)
+    return '{extra[json]}\n'
+
+
+def add_sink(sink, prefix: str = '', **kwargs) -> None:
+    logger.add(sink=sink, format=json_format if settings.LOG_JSON else prefix + log_format,
+               filter=log_filter, enqueue=settings.LOG_ENQUEUE, **kwargs)
+
 
 logger.remove()
-logger.add(sink=sys.stdout, format="<white>{time:YYYY-MM-DD HH:mm:ss}</white>"
-                                   " | <level>{level: <8}</level>"
-                                   " | <cyan><b>{line}</b></cyan>"
-                                   " - <white><b>{message}</b></white>")
+add_sink(sys.stdout)
+if settings.LOG_ENQUEUE:
+    # the writer thread has to drain its queue before the interpreter exits
+    atexit.register(logger.remove)
 logger = logger.opt(colors=True)
@@ -0,0 +1,112 @@
+from bisect import bisect_left
+
+from aiohttp import web
+
+
+def escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metric:
+    kind = ''
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.values: dict[tuple, float] = {}
+        metrics.append(self)
+
+    def format_labels(self, values: tuple, **extra) -> str:
+        pairs = [*zip(self.labels, values), *extra.items()]
+        return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in pairs) + '}' if pairs else ''
+
+    def render(self) -> list[str]:
+        return [f'{self.name}{self.format_labels(key)} {value}' for key, value in self.values.items()]
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def set(self, *labels, value: float) -> None:
+        self.values[labels] = value
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)):
+        super().__init__(name, description, labels)
+        self.buckets = buckets
+        self.series: dict[tuple, list] = {}
+
+    def observe(self, *labels, value: float) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            # per-bucket counts, the cumulative form is only built when the endpoint is scraped
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> list[str]:
+        lines = []
+        for key, (counts, total) in self.series.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{self.format_labels(key, le=bound)} {cumulative}')
+            lines.append(f'{self.name}_sum{self.format_labels(key)} {total}')
+            lines.append(f'{self.name}_count{self.format_labels(key)} {cumulative}')
+        return lines
+
+
+metrics: list[Metric] = []
+
+http_requests = Counter('paws_http_requests_total', 'HTTP requests by endpoint, status and proxy',
+                        ('host', 'endpoint', 'method', 'status', 'proxy'))
+http_latency = Histogram('paws_http_request_seconds', 'HTTP request latency by endpoint',
+                         ('host', 'endpoint', 'method'))
+http_connections = Counter('paws_http_connections_total', 'New HTTP connections by transport and proxy',
+                           ('transport', 'proxy'))
+http_handshake = Histogram('paws_http_handshake_seconds', 'TCP and TLS handshake time of new HTTP connections',
+                           ('transport',))
+retries = Counter('paws_retries_total', 'Retried API operations', ('operation',))
+accounts = Gauge('paws_accounts', 'Accounts by current state', ('state',))
+circuit_state = Gauge('paws_circuit_state', 'Circuit breaker state by endpoint (0 closed, 1 half-open, 2 open)',
+                      ('endpoint',))
+
+
+def render() -> str:
+    lines = []
+    for metric in metrics:
+        lines.append(f'# HELP {metric.name} {metric.description}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+async def handle_metrics(request: web.Request) -> web.Response:
+    return web.Response(text=render(), content_type='text/plain', charset='utf-8')
+
+
+async def start_metrics_server(port: int) -> web.AppRunner:
+    app = web.Application()
+    app.router.add_get('/metrics', handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host='127.0.0.1', port=port).start()
+    return runner
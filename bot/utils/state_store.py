@@ -0,0 +1,91 @@
+import base64
+import json
+import sqlite3
+from time import time
+from urllib.parse import parse_qs, unquote
+
+
+columns = {
+    'access_token': 'TEXT',
+    'created_at': 'REAL',
+    'expires_at': 'REAL',
+    'paws_id': 'TEXT',
+    'wallet': 'TEXT',
+    'solana_wallet': 'TEXT',
+    'ton_proof': 'INTEGER',
+    'sol_proof': 'INTEGER',
+    'activity_missing': 'INTEGER',
+    'next_cycle_at': 'REAL',
+    'tg_web_data': 'TEXT',
+    'tg_auth_date': 'REAL',
+}
+
+
+def get_token_expiry(token: str, default: float) -> float:
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return default
+
+
+def get_auth_date(tg_web_data: str) -> float:
+    params = parse_qs(tg_web_data)
+    if 'auth_date' not in params:
+        params = parse_qs(unquote(tg_web_data))
+    try:
+        return float(params['auth_date'][0])
+    except (KeyError, ValueError):
+        return 0
+
+
+def is_token_valid(state: dict, margin: float = 300) -> bool:
+    return bool(state.get('access_token')) and (state.get('expires_at') or 0) - margin > time()
+
+
+class StateStore:
+    def __init__(self, path: str = 'sessions/state.db'):
+        self.path = path
+        self._connection = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, timeout=30)
+            self._connection.row_factory = sqlite3.Row
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            fields = ', '.join(f'{name} {kind}' for name, kind in columns.items())
+            self._connection.execute(f'CREATE TABLE IF NOT EXISTS accounts (session_name TEXT PRIMARY KEY, {fields})')
+            existing = {row['name'] for row in self._connection.execute('PRAGMA table_info(accounts)')}
+            for name, kind in columns.items():
+                if name not in existing:
+                    self._connection.execute(f'ALTER TABLE accounts ADD COLUMN {name} {kind}')
+            self._connection.commit()
+        return self._connection
+
+    def load(self, session_name: str) -> dict | None:
+        row = self.connection.execute('SELECT * FROM accounts WHERE session_name = ?', (session_name,)).fetchone()
+        return dict(row) if row else None
+
+    def load_all(self) -> dict[str, dict]:
+        return {row['session_name']: dict(row) for row in self.connection.execute('SELECT * FROM accounts')}
+
+    def save(self, session_name: str, **fields) -> None:
+        names = [name for name in fields if name in columns]
+        placeholders = ', '.join('?' for _ in names)
+        updates = ', '.join(f'{name} = excluded.{name}' for name in names)
+        with self.connection:
+            self.connection.execute(
+                f'INSERT INTO accounts (session_name, {", ".join(names)}) VALUES (?, {placeholders}) '
+                f'ON CONFLICT(session_name) DO UPDATE SET {updates}',
+                (session_name, *(fields[name] for name in names)))
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+state_store = StateStore()
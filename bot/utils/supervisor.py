@@ -0,0 +1,106 @@
+import asyncio
+import multiprocessing
+import sys
+import threading
+from collections import defaultdict
+from time import time
+
+from bot.utils import logger
+from bot.utils.logger import add_sink
+
+
+def run_shard(shard: int, accounts: list[dict], log_queue, direct_shards: int) -> None:
+    from bot.config import settings
+    from bot.core.rate_limiter import rate_limiter
+    from bot.utils.launcher import run_tasks
+
+    if settings.METRICS_PORT:
+        settings.METRICS_PORT += shard
+    # accounts without a proxy share one IP across the shards, so they share its rate limits too
+    rate_limiter.direct_share = 1 / max(direct_shards, 1)
+
+    # every line goes to the supervisor so shards do not interleave partial writes
+    logger.remove()
+    logger.configure(extra={'shard': shard})
+    add_sink(lambda message: log_queue.put(str(message)), prefix=f"<m>shard {shard}</m> | ",
+             colorize=not settings.LOG_JSON)
+    try:
+        asyncio.run(run_tasks(accounts=accounts))
+    except KeyboardInterrupt:
+        pass
+
+
+def print_logs(log_queue) -> None:
+    for message in iter(log_queue.get, None):
+        sys.stdout.write(message)
+        sys.stdout.flush()
+
+
+def split_accounts(accounts: list[dict], workers: int) -> list[list[dict]]:
+    # all accounts of a proxy stay in one shard, so per-proxy limits and connection pools hold
+    groups = defaultdict(list)
+    for account in accounts:
+        groups[account.get('proxy') or None].append(account)
+    direct = groups.pop(None, [])
+    shards = [[] for _ in range(workers)]
+    for group in sorted(groups.values(), key=len, reverse=True):
+        min(shards, key=len).extend(group)
+    for account in direct:
+        min(shards, key=len).append(account)
+    return [shard for shard in shards if shard]
+
+
+async def run_workers(accounts: list[dict], workers: int) -> None:
+    shards = split_accounts(accounts, workers)
+    direct_shards = sum(any(not account.get('proxy') for account in shard) for shard in shards)
+    context = multiprocessing.get_context('spawn')
+    log_queue = context.Queue()
+    log_thread = threading.Thread(target=print_logs, args=(log_queue,), daemon=True)
+    log_thread.start()
+
+    processes = {}
+    started_at = {}
+    restart_at = {}
+    restarts = [0] * len(shards)
+
+    def start(shard: int) -> None:
+        process = context.Process(target=run_shard, args=(shard, shards[shard], log_queue, direct_shards),
+                                  name=f'shard-{shard}', daemon=True)
+        process.start()
+        processes[shard] = process
+        started_at[shard] = time()
+
+    for shard, shard_accounts in enumerate(shards):
+        start(shard)
+        logger.info(f"Started shard <e>{shard}</e> with <e>{len(shard_accounts)}</e> account/s")
+
+    try:
+        while processes or restart_at:
+            await asyncio.sleep(delay=1)
+            for shard, process in list(processes.items()):
+                if process.is_alive():
+                    continue
+                del processes[shard]
+                if process.exitcode == 0:
+                    logger.info(f"Shard <e>{shard}</e> finished")
+                    continue
+
+                if time() - started_at[shard] > 600:
+                    restarts[shard] = 0
+                delay = min(300, 5 * 2 ** restarts[shard])
+                restarts[shard] += 1
+                restart_at[shard] = time() + delay
+                logger.warning(f"Shard <e>{shard}</e> exited with code <r>{process.exitcode}</r> "
+                               f"| Restart in <y>{delay}</y> sec")
+
+            for shard, start_time in list(restart_at.items()):
+                if time() >= start_time:
+                    del restart_at[shard]
+                    start(shard)
+    finally:
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            process.join()
+        log_queue.put(None)
+        log_thread.join(timeout=5)
@@ -0,0 +1,5 @@
+import os
+
+# settings are read at import time and require Telegram app credentials
+os.environ.setdefault('API_ID', '1')
+os.environ.setdefault('API_HASH', 'test')
@@ -0,0 +1,47 @@
+import json
+import os
+from time import monotonic
+
+from bot.core.agents import generate_random_user_agent
+from bot.utils import accounts as accounts_module
+from bot.utils.account_store import AccountStore
+
+ACCOUNTS = 5000
+# accounts saved before Telegram params were added to the User-Agent, they are upgraded at startup
+OUTDATED_SHARE = 10
+STARTUP_BUDGET = 2
+
+
+def write_accounts(path: str) -> list[str]:
+    accounts = []
+    for index in range(ACCOUNTS):
+        user_agent = generate_random_user_agent(device_type='android', browser_type='chrome')
+        if index % OUTDATED_SHARE == 0:
+            user_agent = user_agent.split(' Telegram-Android')[0]
+        accounts.append({'session_name': f'session_{index}', 'user_agent': user_agent,
+                         'proxy': f'socks5://user:pass:10.0.{index // 250}.{index % 250}:1080'})
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(accounts, file, ensure_ascii=False, indent=2)
+    return [account['session_name'] for account in accounts]
+
+
+def test_startup_loads_and_upgrades_accounts_with_one_write(monkeypatch, tmp_path):
+    path = str(tmp_path / 'accounts.json')
+    sessions = write_accounts(path)
+    store = AccountStore(path)
+    monkeypatch.setattr(accounts_module, 'account_store', store)
+    writes = []
+    monkeypatch.setattr(os, 'replace', lambda src, dst: writes.append(dst) or os.rename(src, dst))
+
+    started = monotonic()
+    available = accounts_module.Accounts.get_available_accounts(sessions)
+    elapsed = monotonic() - started
+
+    print(f'{ACCOUNTS} accounts loaded in {elapsed:.3f} sec')
+    assert len(available) == ACCOUNTS
+    assert writes == [path]
+    assert elapsed < STARTUP_BUDGET
+    with open(path, encoding='utf-8') as file:
+        saved = {account['session_name']: account for account in json.load(file)}
+    assert all('Telegram-Android' in account['user_agent'] for account in saved.values())
+    assert saved['session_1'] == store.get('session_1')
@@ -0,0 +1,54 @@
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from bot.core.agents import (android_device_pattern, generate_random_user_agent, get_manufacturer, get_sec_ch_ua,
+                             get_telegram_custom_params, is_latest_tg_version, is_user_agent_valid)
+
+ACCOUNTS = 100_000
+
+
+def run(benchmark, func, *args):
+    return benchmark.pedantic(func, args=args, rounds=3, iterations=1, warmup_rounds=1)
+
+
+@pytest.fixture(scope='module')
+def user_agents() -> list[str]:
+    return [generate_random_user_agent(device_type='android', browser_type='chrome') for _ in range(ACCOUNTS)]
+
+
+@pytest.fixture(scope='module')
+def outdated_user_agents(user_agents) -> list[str]:
+    return [user_agent.split(' Telegram-Android')[0] for user_agent in user_agents]
+
+
+def test_generate_user_agents(benchmark):
+    result = run(benchmark, lambda: [generate_random_user_agent(device_type='android', browser_type='chrome')
+                                     for _ in range(ACCOUNTS)])
+    assert all(result)
+
+
+def test_validate_user_agents(benchmark, user_agents, outdated_user_agents):
+    result = run(benchmark, lambda: sum(map(is_user_agent_valid, user_agents + outdated_user_agents)))
+    assert result == ACCOUNTS
+
+
+def test_latest_tg_version(benchmark, user_agents):
+    assert run(benchmark, lambda: all(map(is_latest_tg_version, user_agents)))
+
+
+def test_sec_ch_ua(benchmark, user_agents):
+    result = run(benchmark, lambda: list(map(get_sec_ch_ua, user_agents)))
+    assert all('"Chromium";v="' in sec_ch_ua for sec_ch_ua in result)
+
+
+def test_telegram_custom_params(benchmark, outdated_user_agents):
+    result = run(benchmark, lambda: list(map(get_telegram_custom_params, outdated_user_agents)))
+    assert all(params and params.startswith(' Telegram-Android/') for params in result)
+
+
+def test_manufacturer_lookup(benchmark, user_agents):
+    devices = [android_device_pattern.search(user_agent).group(1) for user_agent in user_agents]
+    devices = [device for device in devices if device != 'K']
+    result = run(benchmark, lambda: list(map(get_manufacturer, devices)))
+    assert all(result)
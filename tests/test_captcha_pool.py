@@ -0,0 +1,80 @@
+import asyncio
+
+from bot.config import settings
+from bot.core import captcha_pool as captcha_pool_module
+from bot.core.captcha_pool import CaptchaTokenPool
+
+
+class FakeSolver:
+    def __init__(self, answers: list[str] | None = None):
+        self.answers = answers or []
+        self.user_agents = []
+
+    async def get_balance(self) -> str:
+        return '10'
+
+    async def run(self, data: dict) -> str:
+        await asyncio.sleep(0.05)
+        self.user_agents.append(data['userAgent'])
+        return self.answers.pop(0) if self.answers else f"token-{data['userAgent']}"
+
+
+def use_solver(monkeypatch, solver: FakeSolver) -> None:
+    monkeypatch.setattr(captcha_pool_module, 'get_async_solver', lambda key: solver)
+    monkeypatch.setattr(captcha_pool_module, 'randint', lambda a, b: 0)
+    monkeypatch.setattr(settings, 'CAPTCHA_POOL_SIZE', 5)
+    monkeypatch.setattr(settings, 'CAPTCHA_TOKEN_TTL', 110)
+
+
+def test_tokens_are_solved_with_and_given_to_their_own_account(monkeypatch):
+    solver = FakeSolver()
+    use_solver(monkeypatch, solver)
+
+    async def scenario():
+        pool = CaptchaTokenPool()
+        pool.register('a', user_agent='ua-a')
+        pool.register('b', user_agent='ua-b')
+        await asyncio.sleep(0.1)
+        return await pool.acquire('b', user_agent='ua-b'), await pool.acquire('a', user_agent='ua-a')
+
+    assert asyncio.run(scenario()) == ('token-ua-b', 'token-ua-a')
+    assert sorted(solver.user_agents) == ['ua-a', 'ua-b']
+
+
+def test_pool_size_caps_solves_ahead_of_demand(monkeypatch):
+    use_solver(monkeypatch, FakeSolver())
+    monkeypatch.setattr(settings, 'CAPTCHA_POOL_SIZE', 1)
+
+    async def scenario():
+        pool = CaptchaTokenPool()
+        for session_name in ('a', 'b', 'c'):
+            pool.register(session_name, user_agent=f'ua-{session_name}')
+        solving = len(pool.solving)
+        # an account that needs its token now does not wait for the queue
+        token = await pool.acquire('c', user_agent='ua-c')
+        return solving, token
+
+    assert asyncio.run(scenario()) == (1, 'token-ua-c')
+
+
+def test_expired_token_is_solved_again(monkeypatch):
+    solver = FakeSolver(answers=['old', 'new'])
+    use_solver(monkeypatch, solver)
+
+    async def scenario():
+        pool = CaptchaTokenPool()
+        monkeypatch.setattr(settings, 'CAPTCHA_TOKEN_TTL', 0.5)
+        pool.register('a', user_agent='ua-a')
+        await asyncio.sleep(0.6)
+        return await pool.acquire('a', user_agent='ua-a')
+
+    assert asyncio.run(scenario()) == 'new'
+
+
+def test_error_answers_are_never_handed_out(monkeypatch):
+    use_solver(monkeypatch, FakeSolver(answers=['ERROR_ZERO_BALANCE', 'ERROR_CAPTCHA_UNSOLVABLE', 'valid']))
+
+    async def scenario():
+        return await CaptchaTokenPool().acquire('a', user_agent='ua-a')
+
+    assert asyncio.run(scenario()) == 'valid'
@@ -0,0 +1,63 @@
+import asyncio
+from time import monotonic
+
+from aiohttp import web
+
+from bot.config import settings
+from bot.core.http_client import HttpClient
+from bot.core.rate_limiter import rate_limiter
+
+ACCOUNTS = 50
+ROUNDS = 5
+SLOW_DELAY = 3
+
+
+async def start_server(delay: float) -> tuple[web.AppRunner, str]:
+    async def handler(request: web.Request) -> web.Response:
+        await asyncio.sleep(delay)
+        return web.json_response({'success': True})
+
+    app = web.Application()
+    app.router.add_get('/', handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host='127.0.0.1', port=0).start()
+    return runner, f'http://127.0.0.1:{runner.addresses[0][1]}/'
+
+
+async def run_with_slow_upstream() -> tuple[int, float, bool]:
+    slow_runner, slow_url = await start_server(delay=SLOW_DELAY)
+    fast_runner, fast_url = await start_server(delay=0.01)
+    slow_client = HttpClient(headers={})
+    clients = [HttpClient(headers={}) for _ in range(ACCOUNTS)]
+    slow_request = asyncio.create_task(slow_client.get(slow_url, timeout=30))
+    await asyncio.sleep(0.1)
+
+    started = monotonic()
+    completed = 0
+    for _ in range(ROUNDS):
+        responses = await asyncio.gather(*(client.get(fast_url) for client in clients))
+        completed += sum(bool(response) for response in responses)
+    elapsed = monotonic() - started
+    slow_pending = not slow_request.done()
+
+    slow_request.cancel()
+    await asyncio.gather(slow_request, return_exceptions=True)
+    for client in (slow_client, *clients):
+        await client.close()
+    await fast_runner.cleanup()
+    await slow_runner.cleanup()
+    return completed, elapsed, slow_pending
+
+
+def test_accounts_progress_while_one_upstream_is_slow(monkeypatch):
+    monkeypatch.setattr(settings, 'RATE_LIMITS', {})
+    monkeypatch.setattr(settings, 'RATE_LIMIT_DEFAULT', 0)
+    monkeypatch.setattr(rate_limiter, 'buckets', {})
+
+    completed, elapsed, slow_pending = asyncio.run(run_with_slow_upstream())
+
+    print(f'{completed} requests of {ACCOUNTS} accounts in {elapsed:.2f} sec next to a {SLOW_DELAY} sec upstream')
+    assert slow_pending
+    assert completed == ACCOUNTS * ROUNDS
+    assert elapsed < SLOW_DELAY
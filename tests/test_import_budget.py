@@ -0,0 +1,61 @@
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+import_time_pattern = re.compile(r'import time:\s+\d+ \|\s+(\d+) \| (\S.*)$')
+
+# modules every action pays for, config and logger are the floor
+LAUNCHER_BUDGET = 1000
+# extra modules imported by each action of the launcher and their budget on top of it, in ms
+ACTIONS = {
+    'run bot': (('bot.utils.accounts', 'bot.utils.supervisor', 'bot.core.scheduler', 'bot.core.tapper',
+                 'bot.core.TgManager.tg_manager'), 2500),
+    'create session': (('bot.core.registrator',), 1500),
+    'generate TON wallets': (('bot.core.WalletManager.WalletManager',), 1500),
+    'generate Solana wallets': (('bot.core.WalletManager.SolanaManager',), 2000),
+    'import sessions': (('bot.core.importer',), 150),
+    'load test': (('bot.utils.load_test', 'bot.core.mock_server'), 500),
+}
+# the launcher itself must not load the HTTP stack, the TG client or the wallet libraries
+HEAVY_MODULES = ('aiohttp', 'httpx', 'cloudscraper', 'aiocfscrape', 'bs4', 'pyrogram', 'telethon', 'tonsdk',
+                 'solana', 'solders', 'msgspec')
+
+
+# cumulative import time in ms of every module loaded by `import modules`
+def get_import_times(*modules: str) -> dict[str, float]:
+    command = [sys.executable, '-X', 'importtime', '-c', f'import {", ".join(modules)}']
+    env = {**os.environ, 'PYTHONPATH': ROOT}
+    # the first run only writes bytecode caches
+    subprocess.run(command, cwd=ROOT, env=env, capture_output=True)
+    result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+    if 'ModuleNotFoundError' in result.stderr:
+        pytest.skip(result.stderr.strip().splitlines()[-1])
+    assert result.returncode == 0, result.stderr
+    import_times = {}
+    for line in result.stderr.splitlines():
+        match = import_time_pattern.match(line)
+        if match:
+            import_times[match.group(2).strip()] = int(match.group(1)) / 1000
+    return import_times
+
+
+def test_launcher_import_budget():
+    import_times = get_import_times('bot.utils.launcher')
+
+    assert import_times['bot.utils.launcher'] < LAUNCHER_BUDGET
+    assert not [module for module in HEAVY_MODULES if module in import_times]
+
+
+@pytest.mark.parametrize('action', ACTIONS)
+def test_action_import_budget(action):
+    modules, budget = ACTIONS[action]
+    import_times = get_import_times('bot.utils.launcher', *modules)
+
+    # modules already loaded by the launcher are not reported again, so this is the action's own cost
+    action_time = sum(import_times[module] for module in modules if module in import_times)
+    print(f'{action}: {action_time:.1f} ms')
+    assert action_time < budget
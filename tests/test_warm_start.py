@@ -0,0 +1,70 @@
+import asyncio
+from time import monotonic
+
+import pytest
+
+tapper_module = pytest.importorskip('bot.core.tapper')
+
+from bot.config import settings
+from bot.core.agents import generate_random_user_agent
+from bot.core.mock_server import FakeTGSession, MockPawsServer
+from bot.core.rate_limiter import rate_limiter
+from bot.utils.state_store import state_store
+
+ACCOUNTS = 50
+# a web app init data request over MTProto takes about a second
+MTPROTO_LATENCY = 1.0
+
+
+async def endpoints_unchanged() -> bool:
+    return True
+
+
+async def start_fleet(saved_states: dict[str, dict]) -> float:
+    tappers = []
+    for index in range(ACCOUNTS):
+        session_name = f'bench_{index}'
+        tg_session = FakeTGSession(session_name=session_name, latency=MTPROTO_LATENCY)
+        user_agent = generate_random_user_agent(device_type='android', browser_type='chrome')
+        tapper = tapper_module.Tapper(tg_session=tg_session, user_agent=user_agent, proxy=None)
+        if session_name in saved_states:
+            tapper.restore_state(saved_states[session_name])
+        tappers.append(tapper)
+    started = monotonic()
+    await asyncio.gather(*(tapper.run_cycle() for tapper in tappers))
+    return monotonic() - started
+
+
+async def run_cold_and_warm_start() -> tuple[float, float, int, int]:
+    server = MockPawsServer(latency=0.05)
+    url = await server.start()
+    settings.API_BASE_URL = f'{url}/v1'
+    try:
+        cold = await start_fleet(saved_states={})
+        cold_logins = server.requests['/v1/user/auth']
+        warm = await start_fleet(saved_states=state_store.load_all())
+        warm_logins = server.requests['/v1/user/auth'] - cold_logins
+    finally:
+        await server.stop()
+        state_store.close()
+    return cold, warm, cold_logins, warm_logins
+
+
+def test_warm_start_reuses_saved_tokens(monkeypatch, tmp_path):
+    monkeypatch.setattr(tapper_module, 'is_valid_endpoints', endpoints_unchanged)
+    for name, value in {'API_BASE_URL': settings.API_BASE_URL, 'AUTO_TASK': False, 'CHECK_ELIGIBILITY': False,
+                        'VERIFY_WALLETS': False, 'CLEAR_TG_NAME': False, 'RATE_LIMITS': {},
+                        'RATE_LIMIT_DEFAULT': 0}.items():
+        monkeypatch.setattr(settings, name, value)
+    monkeypatch.setattr(rate_limiter, 'buckets', {})
+    state_store.close()
+    monkeypatch.setattr(state_store, 'path', str(tmp_path / 'state.db'))
+
+    cold, warm, cold_logins, warm_logins = asyncio.run(run_cold_and_warm_start())
+
+    print(f'{ACCOUNTS} accounts | cold start: {cold:.2f} sec, {cold_logins} logins '
+          f'| warm start: {warm:.2f} sec, {warm_logins} logins')
+    assert cold_logins == ACCOUNTS
+    assert warm_logins == 0
+    # without the MTProto round trip and the login the warm start is a single user info request per account
+    assert warm < cold / 3